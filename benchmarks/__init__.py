@@ -0,0 +1,4 @@
+"""Benchmarks for secfilr.
+
+Run from the repository root with `python -m benchmarks`.
+"""
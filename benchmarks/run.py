@@ -0,0 +1,211 @@
+"""Run the benchmark suite.
+
+Each case is timed over several runs, reporting the best and mean wall
+time, then run once more under `tracemalloc` for peak memory.
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from benchmarks.server import serve_directory
+from benchmarks.synthetic import make_companyfacts, write_bulkdata
+from secfilr._index import CIKIndex
+from secfilr._models import CompanyFacts, decode_companyfacts_json
+from secfilr._network import HTTPClient
+from secfilr._parse import ParseMetric, metric_labels
+from secfilr.company import Company, StatementType
+from secfilr.fetch import Fetch, FetchBulk, FetchRequest
+
+
+@dataclass
+class Result:
+    """Timing and memory for one benchmark case."""
+    name: str
+    runs: int
+    best: float
+    mean: float
+    peak: int
+
+
+def measure(name: str, fn: Callable[[], object], repeat: int) -> Result:
+    """Time `fn` over `repeat` runs, then trace one run for peak memory."""
+    fn()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(name, repeat, min(times), statistics.mean(times), peak)
+
+
+class _Preloaded(Fetch):
+    """Serve one already decoded companyfacts, to isolate parsing."""
+
+    def __init__(self, companyfacts: CompanyFacts):
+        self._companyfacts = companyfacts
+
+    def companyfacts(self, ticker: str) -> CompanyFacts:
+        return self._companyfacts
+
+
+def cases(
+    root: Path,
+    tickers: list[str],
+    args: argparse.Namespace
+) -> Iterator[tuple[str, Callable[[], object]]]:
+    """Yield (name, callable) benchmark cases over a bulkdata directory."""
+    doc = make_companyfacts(1, 'Synthetic Inc.', args.concepts, args.filings)
+    json_str = json.dumps(doc)
+    cik_json = (root / 'company_tickers.json').read_text()
+    last_ticker = json.loads(cik_json)[str(args.listed - 1)]['ticker']
+
+    yield 'decode_companyfacts_json', lambda: decode_companyfacts_json(
+        json_str
+    )
+    yield 'decode_companyfacts_json lazy', lambda: decode_companyfacts_json(
+        json_str, lazy=True
+    )
+    yield 'decode_companyfacts_json auto trusted', (
+        lambda: decode_companyfacts_json(
+            json_str, backend='auto', trusted=True
+        )
+    )
+    yield 'CIKIndex.from_json', lambda: CIKIndex.from_json(
+        cik_json
+    ).ticker(last_ticker)
+    cik_index = CIKIndex.from_json(cik_json)
+    yield 'CIKIndex.ticker', lambda: cik_index.ticker(last_ticker)
+
+    companyfacts = decode_companyfacts_json(json_str)
+    concepts = companyfacts.facts.concepts
+    revenue = metric_labels('revenue')
+    yield 'ParseMetric.parse', lambda: ParseMetric(concepts).parse(revenue)
+    yield 'ParseMetric.parse compact', lambda: ParseMetric(concepts).parse(
+        revenue, compact=True
+    )
+
+    preloaded = _Preloaded(companyfacts)
+    yield 'Company.statement', lambda: [
+        Company('SYN', preloaded).statement(statement_t)
+        for statement_t in StatementType
+    ]
+
+    def fetch_bulk(**kwargs) -> Callable[[], object]:
+        def run() -> list[CompanyFacts]:
+            fetcher = FetchBulk(
+                root / 'company_tickers.json',
+                root / 'companyfacts',
+                **kwargs
+            )
+            return [fetcher.companyfacts(t) for t in tickers]
+        return run
+
+    yield 'FetchBulk.companyfacts', fetch_bulk()
+    yield 'FetchBulk.companyfacts lazy', fetch_bulk(lazy=True)
+
+    def fetch_bulk_many() -> list:
+        fetcher = FetchBulk(
+            root / 'company_tickers.json', root / 'companyfacts'
+        )
+        return list(fetcher.companyfacts_many(tickers, workers=args.workers))
+
+    yield 'FetchBulk.companyfacts_many', fetch_bulk_many
+
+    with serve_directory(root) as url:
+        client = HTTPClient(rate_limit=10_000, burst=100)
+
+        def fetch_request() -> list[CompanyFacts]:
+            fetcher = FetchRequest(
+                'secfilr benchmarks',
+                client = client,
+                cik_url = f'{url}/company_tickers.json',
+                facts_url = f'{url}/companyfacts/CIK',
+            )
+            return [fetcher.companyfacts(t) for t in tickers]
+
+        yield 'FetchRequest.companyfacts', fetch_request
+        client.close()
+
+
+def _format_bytes(n: int) -> str:
+    for unit in ('B', 'KiB', 'MiB'):
+        if n < 1024:
+            return f'{n:.0f} {unit}'
+        n /= 1024
+    return f'{n:.1f} GiB'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog = 'python -m benchmarks',
+        description = 'Benchmark secfilr against synthetic EDGAR data.'
+    )
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--concepts', type=int, default=200)
+    parser.add_argument('--filings', type=int, default=80)
+    parser.add_argument('--listed', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '-k', dest='select', default='',
+        help='only run cases whose name contains this text'
+    )
+    parser.add_argument(
+        '--json', type=Path, default=None,
+        help='also write results to this JSON file'
+    )
+    args = parser.parse_args(argv)
+
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        tickers = write_bulkdata(
+            root,
+            companies = args.companies,
+            concepts = args.concepts,
+            filings = args.filings,
+            listed = args.listed
+        )
+        print(
+            f'{args.companies} companies, {args.concepts} concepts, '
+            f'{args.filings} filings per concept, best of {args.repeat}\n'
+        )
+        print(f'{"case":<40} {"best":>10} {"mean":>10} {"peak":>11}')
+        for name, fn in cases(root, tickers, args):
+            if args.select not in name:
+                continue
+            result = measure(name, fn, args.repeat)
+            results.append(result)
+            print(
+                f'{name:<40} {result.best * 1e3:>8.2f}ms '
+                f'{result.mean * 1e3:>8.2f}ms '
+                f'{_format_bytes(result.peak):>11}'
+            )
+
+    if args.json is not None:
+        args.json.write_text(
+            json.dumps([asdict(r) for r in results], indent=2)
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
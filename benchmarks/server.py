@@ -0,0 +1,39 @@
+"""Local stand-in for SEC EDGAR endpoints, serving a bulkdata directory."""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serve_directory(root: Path) -> Iterator[str]:
+    """Serve `root` over HTTP/1.1 on localhost, yielding its base URL.
+
+    With a `write_bulkdata` directory, company_tickers.json is at
+    `{url}/company_tickers.json` and companyfacts at
+    `{url}/companyfacts/CIK##########.json`.
+    """
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), partial(_Handler, directory=str(root))
+    )
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={'poll_interval': 0.05}
+    )
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,169 @@
+"""Synthetic SEC EDGAR fixtures.
+
+Generates companyfacts and company_tickers.json data shaped like the
+real EDGAR files, at a configurable size. Every statement metric secfilr
+knows is present, padded out with filler concepts.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+from secfilr import _xbrl_labels
+
+# First, most relevant label of every statement metric
+STATEMENT_CONCEPTS = tuple(dict.fromkeys(
+    labels[0]
+    for statement in _xbrl_labels.statements.values()
+    for labels in statement.values()
+))
+
+_INSTANT_SECTIONS = ('Balance Sheet',)
+INSTANT_CONCEPTS = frozenset(
+    labels[0]
+    for section in _INSTANT_SECTIONS
+    for labels in _xbrl_labels.statements[section].values()
+)
+
+
+def _quarter_end(year: int, quarter: int) -> date:
+    if quarter == 4:
+        return date(year, 12, 31)
+    return date(year, 3 * quarter + 1, 1) - timedelta(days=1)
+
+
+def make_filings(
+    count: int,
+    rng: random.Random,
+    instant: bool,
+    cik: int
+) -> list[dict]:
+    """Build `count` quarterly filings ending with 2024 Q4.
+
+    Every fifth filing is followed by an un-framed restatement, as SEC
+    leaves the frame off values repeated in later filings.
+    """
+    quarters = count - count // 6
+    year, quarter = 2024, 4
+    periods = []
+    for _ in range(quarters):
+        periods.append((year, quarter))
+        year, quarter = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+    periods.reverse()
+
+    filings: list[dict] = []
+    value = rng.uniform(1e6, 1e9)
+    for i, (year, quarter) in enumerate(periods):
+        end = _quarter_end(year, quarter)
+        value *= rng.uniform(0.95, 1.08)
+        filing = {
+            'end': end.isoformat(),
+            'val': round(value),
+            'accn': f'{cik:010d}-{year % 100:02d}-{i:06d}',
+            'fy': year,
+            'fp': 'FY' if quarter == 4 else f'Q{quarter}',
+            'form': '10-K' if quarter == 4 else '10-Q',
+            'filed': (end + timedelta(days=35)).isoformat(),
+            'frame': f'CY{year}Q{quarter}' + ('I' if instant else ''),
+        }
+        if not instant:
+            start = end - timedelta(days=90)
+            filing = {'start': start.isoformat(), **filing}
+        filings.append(filing)
+        if i % 5 == 4 and len(filings) < count:
+            restated = dict(filing)
+            restated.pop('frame')
+            restated['filed'] = (end + timedelta(days=400)).isoformat()
+            filings.append(restated)
+    return filings[:count]
+
+
+def make_companyfacts(
+    cik: int,
+    name: str,
+    concepts: int = 200,
+    filings: int = 80,
+    seed: int = 0
+) -> dict:
+    """Build one companyfacts document.
+
+    Args:
+        cik (int): company CIK
+        name (str): entity name
+        concepts (int): us-gaap concepts, at least the statement metrics
+        filings (int): filings per concept
+        seed (int): random seed
+    """
+    rng = random.Random(seed * 1_000_003 + cik)
+    names = list(STATEMENT_CONCEPTS)
+    names += [
+        f'SyntheticConcept{i:04d}'
+        for i in range(max(0, concepts - len(names)))
+    ]
+    us_gaap = {}
+    for concept in names:
+        instant = concept in INSTANT_CONCEPTS or rng.random() < 0.4
+        unit = 'USD/shares' if 'PerShare' in concept else 'USD'
+        us_gaap[concept] = {
+            'label': concept,
+            'description': f'Synthetic description of {concept}. ' * 3,
+            'units': {unit: make_filings(filings, rng, instant, cik)},
+        }
+    return {
+        'cik': cik,
+        'entityName': name,
+        'facts': {
+            'dei': {
+                'EntityCommonStockSharesOutstanding': {
+                    'label': 'Entity Common Stock, Shares Outstanding',
+                    'description': 'Shares outstanding.',
+                    'units': {'shares': make_filings(8, rng, True, cik)},
+                },
+            },
+            'us-gaap': us_gaap,
+        },
+    }
+
+
+def make_company_tickers(count: int) -> dict[str, dict]:
+    """Build company_tickers.json data for `count` companies."""
+    return {
+        str(i): {
+            'cik_str': 1_000_000 + i,
+            'ticker': f'T{i:05d}',
+            'title': f'Synthetic Company {i} Inc.',
+        }
+        for i in range(count)
+    }
+
+
+def write_bulkdata(
+    root: Path,
+    companies: int = 20,
+    concepts: int = 200,
+    filings: int = 80,
+    listed: int = 10_000
+) -> list[str]:
+    """Write a Downloader-shaped bulkdata directory.
+
+    Args:
+        root (Path): destination directory
+        companies (int): companies with companyfacts files
+        concepts (int): us-gaap concepts per company
+        filings (int): filings per concept
+        listed (int): companies in company_tickers.json
+    Returns:
+        list[str]: tickers of the companies with companyfacts files
+    """
+    facts_dir = root / 'companyfacts'
+    facts_dir.mkdir(parents=True, exist_ok=True)
+    tickers = make_company_tickers(max(listed, companies))
+    (root / 'company_tickers.json').write_text(json.dumps(tickers))
+
+    entries = list(tickers.values())[:companies]
+    for entry in entries:
+        cik = entry['cik_str']
+        facts = make_companyfacts(cik, entry['title'], concepts, filings)
+        (facts_dir / f'CIK{cik:010d}.json').write_text(json.dumps(facts))
+    return [entry['ticker'] for entry in entries]
@@ -0,0 +1,5 @@
+import sys
+
+from secfilr.cli import main
+
+sys.exit(main())
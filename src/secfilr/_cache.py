@@ -0,0 +1,215 @@
+"""On-disk HTTP response cache.
+
+Response bodies are stored as files, optionally zlib-compressed, with a
+SQLite index holding validators, timestamps and sizes for TTL checks,
+ETag revalidation and least-recently-used eviction.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from secfilr._network import HTTPClient, default_client
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    compressed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+'''
+
+
+class HTTPCache:
+    """Disk-backed cache for GET responses, keyed by URL.
+
+    Args:
+        directory (Path): cache directory, created if missing
+        ttl (float): seconds a response is served without revalidation
+        max_bytes (int): cap on stored body size, least recently used
+            entries are evicted beyond it
+        compress (bool): zlib-compress stored bodies
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = 3600.0,
+        max_bytes: int = 1 << 30,
+        compress: bool = True
+    ) -> None:
+        """Open or create the cache index."""
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.directory / 'index.sqlite',
+            timeout = 30.0,
+            check_same_thread = False
+        )
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def __repr__(self) -> str:
+        return f"HTTPCache(directory='{self.directory}')"
+
+    def close(self) -> None:
+        """Close the cache index."""
+        self._db.close()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f'{key}.body'
+
+    def _read_body(self, key: str, compressed: bool) -> str | None:
+        """Read a stored body, None if it has gone missing."""
+        try:
+            data = self._body_path(key).read_bytes()
+            if compressed:
+                data = zlib.decompress(data)
+        except (OSError, zlib.error):
+            return None
+        return data.decode('utf-8')
+
+    def _write_body(self, key: str, text: str) -> int:
+        """Write a body atomically, returning its size on disk."""
+        data = text.encode('utf-8')
+        if self.compress:
+            data = zlib.compress(data, 6)
+        path = self._body_path(key)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return len(data)
+
+    def _lookup(self, key: str) -> tuple | None:
+        with self._lock:
+            return self._db.execute(
+                'SELECT etag, last_modified, stored, compressed '
+                'FROM entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+
+    def _touch(self, key: str, stored: float | None = None) -> None:
+        """Mark an entry as used, and optionally as revalidated."""
+        now = time.time()
+        with self._lock, self._db:
+            if stored is None:
+                self._db.execute(
+                    'UPDATE entries SET accessed = ? WHERE key = ?',
+                    (now, key)
+                )
+            else:
+                self._db.execute(
+                    'UPDATE entries SET accessed = ?, stored = ? '
+                    'WHERE key = ?',
+                    (now, stored, key)
+                )
+
+    def _store(
+        self,
+        key: str,
+        url: str,
+        text: str,
+        etag: str | None,
+        modified: str | None
+    ) -> None:
+        """Store a body and evict least recently used entries."""
+        size = self._write_body(key, text)
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, etag, modified, now, now, size, int(self.compress))
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """Evict least recently used entries until under `max_bytes`."""
+        with self._lock, self._db:
+            total = self._db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()[0]
+            rows = self._db.execute(
+                'SELECT key, size FROM entries ORDER BY accessed'
+            ) if total > self.max_bytes else []
+            evicted = []
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                evicted.append(key)
+                total -= size
+            self._db.executemany(
+                'DELETE FROM entries WHERE key = ?', ((k,) for k in evicted)
+            )
+        for key in evicted:
+            self._body_path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock, self._db:
+            keys = [k for k, in self._db.execute('SELECT key FROM entries')]
+            self._db.execute('DELETE FROM entries')
+        for key in keys:
+            self._body_path(key).unlink(missing_ok=True)
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        client: HTTPClient | None = None
+    ) -> str:
+        """Get a response body, from the cache when fresh or unchanged.
+
+        Fresh entries are served without a request. Stale entries are
+        revalidated with If-None-Match / If-Modified-Since, and a 304
+        renews them without downloading the body again.
+        """
+        client = client or default_client()
+        key = self._key(url)
+        entry = self._lookup(key)
+        request_headers = dict(headers or {})
+
+        if entry is not None:
+            etag, modified, stored, compressed = entry
+            body = self._read_body(key, bool(compressed))
+            if body is None:
+                entry = None
+            elif time.time() - stored < self.ttl:
+                self._touch(key)
+                return body
+            else:
+                if etag:
+                    request_headers['If-None-Match'] = etag
+                if modified:
+                    request_headers['If-Modified-Since'] = modified
+
+        response = client.get(url=url, headers=request_headers)
+        if response.status_code == 304 and entry is not None:
+            self._touch(key, stored=time.time())
+            return body
+        text = response.text
+        self._store(
+            key,
+            url,
+            text,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+        return text
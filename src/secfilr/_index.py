@@ -0,0 +1,173 @@
+"""Lookup indexes.
+
+`CIKIndex` is built once from company_tickers.json data, and optionally
+persisted to disk in a compact form so later processes can skip
+re-validation. `index_zip_members` maps CIKs to companyfacts.zip members.
+"""
+
+import json
+import re
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from secfilr import instrument
+from secfilr._json import get_loads
+from secfilr._models import CompanyCIK
+from secfilr.exceptions import FetchError, FileDecodeError, TickerNotFound
+
+
+class CIKIndex:
+    """O(1) lookups by ticker symbol and by CIK.
+
+    Args:
+        entries (Iterable[CompanyCIK]): companies in SEC listing order
+        timestamp (float): UNIX time the source data was retrieved
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[CompanyCIK],
+        timestamp: float | None = None
+    ) -> None:
+        """Build lookup tables from entries."""
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self._entries: list[CompanyCIK] = list(entries)
+        self._by_ticker: dict[str, CompanyCIK] = {}
+        self._by_cik: dict[int, CompanyCIK] = {}
+        # First listing wins, SEC lists primary share classes first
+        for entry in self._entries:
+            self._by_ticker.setdefault(entry.ticker.lower(), entry)
+            self._by_cik.setdefault(entry.cik, entry)
+
+    def __repr__(self) -> str:
+        return f'CIKIndex(entries={len(self._entries)})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[CompanyCIK]:
+        return iter(self._entries)
+
+    def __contains__(self, ticker: object) -> bool:
+        if not isinstance(ticker, str):
+            return False
+        return ticker.strip().lower() in self._by_ticker
+
+    def ticker(self, ticker: str) -> CompanyCIK:
+        """Look up CIK data by ticker symbol."""
+        try:
+            return self._by_ticker[ticker.strip().lower()]
+        except KeyError as e:
+            raise TickerNotFound(
+                f'{ticker} Not found in CIK mapping data'
+            ) from e
+
+    def cik(self, cik: int) -> CompanyCIK:
+        """Look up CIK data by CIK number."""
+        try:
+            return self._by_cik[int(cik)]
+        except KeyError as e:
+            raise TickerNotFound(
+                f'CIK {cik} Not found in CIK mapping data'
+            ) from e
+
+    def ciks(self) -> list[int]:
+        """Get all unique CIK numbers in listing order."""
+        return list(self._by_cik)
+
+    @classmethod
+    def from_json(
+        cls,
+        json_str: str,
+        timestamp: float | None = None,
+        backend: str = 'stdlib',
+        trusted: bool = False
+    ) -> 'CIKIndex':
+        """Build index from company_tickers.json text.
+
+        Args:
+            json_str (str): company_tickers.json text
+            timestamp (float): UNIX time the text was retrieved
+            backend (str): JSON backend name, or 'auto'
+            trusted (bool): skip validating entries
+        """
+        with instrument.span('decode', 'company_tickers') as span:
+            span.nbytes = len(json_str)
+            entries = _decode_entries(json_str, backend, trusted)
+        return cls(entries, timestamp=timestamp)
+
+    def dump(self, path: Path) -> None:
+        """Persist index to a compact JSON file."""
+        data = {
+            'timestamp': self.timestamp,
+            'entries': [[e.cik, e.ticker, e.title] for e in self._entries],
+        }
+        try:
+            with open(path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+        except Exception as e:
+            raise FetchError(f'Error writing: {path.resolve()}') from e
+
+    @classmethod
+    def load(cls, path: Path) -> 'CIKIndex':
+        """Load an index persisted with `dump`."""
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            entries = [
+                CompanyCIK.model_construct(cik=cik, ticker=ticker, title=title)
+                for cik, ticker, title in data['entries']
+            ]
+            return cls(entries, timestamp=float(data['timestamp']))
+        except Exception as e:
+            raise FileDecodeError(f'Error loading: {path.resolve()}') from e
+
+
+def _decode_entries(
+    json_str: str,
+    backend: str,
+    trusted: bool
+) -> list[CompanyCIK]:
+    """Decode company_tickers.json text into entries."""
+    loads = get_loads(backend)
+    try:
+        raw: dict[str, dict] = loads(json_str)
+    except ValueError as e:
+        raise FileDecodeError('Error decoding CIK JSON') from e
+
+    try:
+        if trusted:
+            entries = [
+                CompanyCIK.model_construct(
+                    cik=e['cik_str'], ticker=e['ticker'], title=e['title']
+                )
+                for e in raw.values()
+            ]
+        else:
+            entries = [CompanyCIK.model_validate(e) for e in raw.values()]
+    except (ValidationError, AttributeError, KeyError, TypeError) as e:
+        raise FileDecodeError('Error validating CIK JSON') from e
+    return entries
+
+
+_MEMBER_CIK = re.compile(r'CIK(\d{10})\.json$')
+
+
+def member_cik(name: str) -> int | None:
+    """Get the CIK from a companyfacts file or member name."""
+    match = _MEMBER_CIK.search(name)
+    return int(match.group(1)) if match else None
+
+
+def index_zip_members(archive: zipfile.ZipFile) -> dict[int, zipfile.ZipInfo]:
+    """Index companyfacts archive members by CIK."""
+    members = {}
+    for info in archive.infolist():
+        cik = member_cik(info.filename)
+        if cik is not None:
+            members[cik] = info
+    return members
@@ -0,0 +1,81 @@
+"""JSON decode backends.
+
+The standard library decoder is always available. orjson, msgspec and
+ujson are registered when installed, and 'auto' picks the fastest one
+present. Decoders are registered with the error type they raise on bad
+input, and any that isn't a `ValueError` is re-raised as one, so callers
+only need to catch `ValueError`.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+Loads = Callable[[str | bytes], Any]
+
+_BACKENDS: dict[str, Loads] = {}
+
+
+def _register(
+    name: str,
+    loads: Loads,
+    error: type[Exception] = ValueError
+) -> None:
+    """Register a decoder, raising `ValueError` for its `error` type."""
+    if issubclass(error, ValueError):
+        _BACKENDS[name] = loads
+        return
+
+    def checked_loads(data: str | bytes) -> Any:
+        try:
+            return loads(data)
+        except error as e:
+            raise ValueError(str(e)) from e
+
+    _BACKENDS[name] = checked_loads
+
+
+_register('stdlib', json.loads)
+
+try:
+    import orjson
+except ImportError:
+    pass
+else:
+    _register('orjson', orjson.loads)
+
+try:
+    import msgspec
+except ImportError:
+    pass
+else:
+    # msgspec.DecodeError isn't a ValueError
+    _register('msgspec', msgspec.json.decode, msgspec.DecodeError)
+
+try:
+    import ujson
+except ImportError:
+    pass
+else:
+    _register('ujson', ujson.loads)
+
+# Fastest first, for 'auto'
+_PREFERENCE = ('orjson', 'msgspec', 'ujson', 'stdlib')
+
+
+def available_backends() -> list[str]:
+    """Get names of the installed JSON backends, fastest first."""
+    return [name for name in _PREFERENCE if name in _BACKENDS]
+
+
+def get_loads(backend: str) -> Loads:
+    """Get the decode function for a backend name, or 'auto'."""
+    if backend == 'auto':
+        backend = available_backends()[0]
+    try:
+        return _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"JSON backend '{backend}' is not available, "
+            f'choose from: auto, {", ".join(available_backends())}'
+        ) from None
@@ -1,15 +1,29 @@
 """Container objects for secfilr.
 
 Pydantic models based on the shape of JSON filing data from SEC EDGAR.
+`LazyConcepts` mapping for decoding concepts on first access
+`FilingColumns` compact columnar storage for filings
+`PeriodIndex` lookups into filings by frame, fiscal period and end date
 `Concept` dataclass for parsed metric
+`StatementTable` dataclass for statements aligned across periods
+`RatioTable` dataclass for ratio time series
 """
 
 import json
+import math
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from datetime import date
 
 from pydantic import BaseModel, Field, ValidationError
 
-from secfilr.exceptions import FileDecodeError, TickerNotFound
+from secfilr import instrument
+from secfilr._json import get_loads
+from secfilr.exceptions import FileDecodeError
 
 
 class CompanyCIK(BaseModel):
@@ -19,24 +33,6 @@ class CompanyCIK(BaseModel):
     title: str
 
 
-def decode_cik_json(json_str: str, ticker: str) -> CompanyCIK:
-    """Decode CIK JSON text into pydantic based container."""
-    ticker_lower = ticker.lower()
-
-    try:
-        raw: dict[str, dict] = json.loads(json_str)
-    except json.JSONDecodeError as e:
-        raise FileDecodeError('Error decoding CIK JSON') from e
-
-    for entry in raw.values():
-        if entry.get('ticker', '').lower() == ticker_lower:
-            try:
-                return CompanyCIK.model_validate(entry)
-            except ValidationError as e:
-                raise FileDecodeError('Error validating CIK JSON') from e
-    raise TickerNotFound(f'{ticker} Not found in CIK mapping data')
-
-
 class Facts(BaseModel):
     """Raw SEC EDGAR filing data."""
     concepts: dict = Field(alias='us-gaap')
@@ -55,21 +51,550 @@ class CompanyFacts(BaseModel):
         return f"CompanyFacts(cik={self.cik}, name='{self.name}')"
 
 
-def decode_companyfacts_json(json_str: str) -> CompanyFacts:
-    """Decode companyfacts JSON text into pydantic based container."""
+class LazyConcepts(Mapping):
+    """Read-only mapping of concepts decoded on first access.
+
+    Holds the raw companyfacts text and the offset of each us-gaap
+    concept's value, so only the concepts actually used are decoded.
+
+    Args:
+        json_str (str): raw companyfacts JSON text
+        offsets (dict[str, int]): concept name -> offset of its value
+    """
+
+    __slots__ = ('_json_str', '_offsets', '_decoded')
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, json_str: str, offsets: dict[str, int]) -> None:
+        """Initialize raw text and offset index."""
+        self._json_str = json_str
+        self._offsets = offsets
+        self._decoded: dict[str, dict] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f'LazyConcepts(concepts={len(self._offsets)}, '
+            f'decoded={len(self._decoded)})'
+        )
+
+    def __getitem__(self, concept: str) -> dict:
+        try:
+            return self._decoded[concept]
+        except KeyError:
+            pass
+        offset = self._offsets[concept]
+        try:
+            value, _ = self._decoder.raw_decode(self._json_str, offset)
+        except json.JSONDecodeError as e:
+            raise FileDecodeError(f'Error decoding concept {concept}') from e
+        self._decoded[concept] = value
+        return value
+
+    def __contains__(self, concept: object) -> bool:
+        return concept in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by raw text and decoded concepts."""
+        # Copy values first, concepts may be decoded on other threads
+        return sys.getsizeof(self._json_str) + sum(
+            concept_nbytes(v) for v in list(self._decoded.values())
+        )
+
+
+def concept_nbytes(concept: dict) -> int:
+    """Approximate memory held by one decoded concept.
+
+    Sizes the first filing of each unit and scales by the filing count,
+    rather than walking every object.
+    """
+    total = sys.getsizeof(concept)
+    for filings in (concept.get('units') or {}).values():
+        if not filings:
+            continue
+        sample = filings[0]
+        per_filing = sys.getsizeof(sample) + sum(
+            sys.getsizeof(v) for v in sample.values()
+        )
+        total += sys.getsizeof(filings) + per_filing * len(filings)
+    return total
+
+
+def companyfacts_nbytes(companyfacts: CompanyFacts) -> int:
+    """Approximate memory held by a decoded `CompanyFacts`."""
+    concepts = companyfacts.facts.concepts
+    nbytes = getattr(concepts, 'nbytes', None)
+    if nbytes is not None:
+        return nbytes()
+    return sys.getsizeof(concepts) + sum(
+        concept_nbytes(v) for v in concepts.values()
+    )
+
+
+_US_GAAP = re.compile(r'"us-gaap"\s*:\s*\{')
+_LABEL = re.compile(r'"label"\s*:')
+_CIK = re.compile(r'"cik"\s*:\s*(\d+)')
+_ENTITY_NAME = re.compile(r'"entityName"\s*:\s*"')
+_WHITESPACE = ' \t\n\r'
+
+
+def _skip_back(text: str, i: int) -> int:
+    """Step back from `i` over whitespace."""
+    while i > 0 and text[i] in _WHITESPACE:
+        i -= 1
+    return i
+
+
+def _index_us_gaap(json_str: str) -> dict[str, int] | None:
+    """Index offsets of us-gaap concept values in companyfacts JSON.
+
+    Relies on each SEC concept object opening with its "label" key, which
+    no filing object has, to find concepts without a full decode. Returns
+    None if the layout isn't recognised.
+    """
+    match = _US_GAAP.search(json_str)
+    if match is None:
+        return None
+    us_gaap_start = match.end() - 1
+    offsets: dict[str, int] = {}
+
+    for label in _LABEL.finditer(json_str, us_gaap_start):
+        value = _skip_back(json_str, label.start() - 1)
+        if json_str[value] != '{':
+            continue
+        colon = _skip_back(json_str, value - 1)
+        key_end = _skip_back(json_str, colon - 1)
+        if json_str[colon] != ':' or json_str[key_end] != '"':
+            continue
+        key_start = json_str.rfind('"', 0, key_end)
+        before = _skip_back(json_str, key_start - 1)
+        if json_str[before] == '{':
+            # First us-gaap concept, otherwise the next taxonomy has begun
+            if offsets or before != us_gaap_start:
+                break
+        elif json_str[before] != ',':
+            continue
+        offsets[json_str[key_start + 1:key_end]] = value
+
+    return offsets or None
+
+
+def _decode_companyfacts_lazy(json_str: str) -> CompanyFacts | None:
+    """Decode companyfacts header, leaving concepts to `LazyConcepts`."""
+    offsets = _index_us_gaap(json_str)
+    cik = _CIK.search(json_str)
+    name = _ENTITY_NAME.search(json_str)
+    if offsets is None or cik is None or name is None:
+        return None
     try:
-        return CompanyFacts.model_validate_json(json_str)
+        entity_name, _ = json.decoder.scanstring(json_str, name.end())
+    except json.JSONDecodeError:
+        return None
+    return CompanyFacts.model_construct(
+        cik = int(cik.group(1)),
+        name = entity_name,
+        facts = Facts.model_construct(
+            concepts = LazyConcepts(json_str, offsets)
+        )
+    )
+
+
+def _construct_companyfacts(raw: dict) -> CompanyFacts:
+    """Build containers from decoded JSON without validating it."""
+    try:
+        return CompanyFacts.model_construct(
+            cik = int(raw['cik']),
+            name = raw['entityName'],
+            facts = Facts.model_construct(concepts=raw['facts']['us-gaap'])
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise FileDecodeError('Error reading companyfacts JSON') from e
+
+
+def decode_companyfacts_json(
+    json_str: str,
+    lazy: bool = False,
+    backend: str | None = None,
+    trusted: bool = False
+) -> CompanyFacts:
+    """Decode companyfacts JSON text into pydantic based container.
+
+    Args:
+        json_str (str): raw companyfacts JSON text
+        lazy (bool): decode each us-gaap concept on first access, falls
+            back to a full decode if the layout isn't recognised
+        backend (str): JSON backend for a full decode, e.g. 'orjson' or
+            'auto', by default pydantic parses the text itself
+        trusted (bool): skip validation, for data from a trusted source
+    """
+    with instrument.span('decode', 'companyfacts') as span:
+        span.nbytes = len(json_str)
+        return _decode_companyfacts_json(json_str, lazy, backend, trusted)
+
+
+def _decode_companyfacts_json(
+    json_str: str,
+    lazy: bool,
+    backend: str | None,
+    trusted: bool
+) -> CompanyFacts:
+    if lazy:
+        companyfacts = _decode_companyfacts_lazy(json_str)
+        if companyfacts is not None:
+            return companyfacts
+    if backend is None and not trusted:
+        try:
+            return CompanyFacts.model_validate_json(json_str)
+        except ValidationError as e:
+            raise FileDecodeError('Error validating companyfacts JSON') from e
+
+    loads = get_loads(backend or 'stdlib')
+    try:
+        raw = loads(json_str)
+    except ValueError as e:
+        raise FileDecodeError('Error decoding companyfacts JSON') from e
+    if trusted:
+        return _construct_companyfacts(raw)
+    try:
+        return CompanyFacts.model_validate(raw)
     except ValidationError as e:
         raise FileDecodeError('Error validating companyfacts JSON') from e
 
 
+def _day(iso_date: str | None) -> int:
+    """ISO date to day number, 0 if missing."""
+    return date.fromisoformat(iso_date).toordinal() if iso_date else 0
+
+
+def _iso(day: int) -> str:
+    """Day number to ISO date."""
+    return date.fromordinal(day).isoformat()
+
+
+def _intern(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+class _Categorical:
+    """Column of repeated strings stored as codes into a category list."""
+
+    __slots__ = ('codes', 'categories', '_lookup')
+
+    def __init__(self) -> None:
+        self.codes = array('I')
+        self.categories: list[str | None] = []
+        self._lookup: dict[str | None, int] = {}
+
+    def append(self, value: str | None) -> None:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.categories)
+            self.categories.append(_intern(value))
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str | None:
+        return self.categories[self.codes[i]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class FilingRow(Mapping):
+    """Read-only dict-like view of one row of `FilingColumns`.
+
+    Dates are returned as ISO strings and `val` as float, so rows can be
+    used wherever a raw filing dict is expected.
+    """
+
+    __slots__ = ('_columns', '_i')
+
+    def __init__(self, columns: 'FilingColumns', i: int) -> None:
+        self._columns = columns
+        self._i = i
+
+    def __repr__(self) -> str:
+        return f'FilingRow({dict(self)})'
+
+    def __getitem__(self, key: str):
+        cols, i = self._columns, self._i
+        match key:
+            case 'val':
+                return cols.val[i]
+            case 'start' | 'end' | 'filed':
+                day = getattr(cols, key)[i]
+                if not day:
+                    raise KeyError(key)
+                return _iso(day)
+            case 'fy':
+                fy = cols.fy[i]
+                if not fy:
+                    raise KeyError(key)
+                return fy
+            case 'fp' | 'form' | 'frame' | 'accn':
+                value = getattr(cols, key)[i]
+                if value is None:
+                    raise KeyError(key)
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FilingColumns.KEYS:
+            if key in self:
+                yield key
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class FilingColumns(Sequence):
+    """Filings stored as typed columns.
+
+    Values are float64, dates are day numbers (`date.toordinal`, 0 when
+    missing), `fp` and `form` are category codes, and the mostly unique
+    `frame` and `accn` strings are interned so repeats share memory.
+    Numeric columns are `array.array`, so they support the buffer protocol
+    for zero-copy use with array libraries. Indexing returns `FilingRow`
+    views for compatibility with lists of filing dicts.
+    """
+
+    __slots__ = (
+        'val', 'start', 'end', 'filed', 'fy', 'fp', 'form', 'frame', 'accn'
+    )
+
+    KEYS = (
+        'start', 'end', 'val', 'accn', 'fy', 'fp', 'form', 'filed', 'frame'
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.val = array('d')
+        self.start = array('i')
+        self.end = array('i')
+        self.filed = array('i')
+        self.fy = array('i')
+        self.fp = _Categorical()
+        self.form = _Categorical()
+        self.frame: list[str | None] = []
+        self.accn: list[str | None] = []
+
+    def __repr__(self) -> str:
+        return f'FilingColumns(rows={len(self)})'
+
+    @classmethod
+    def from_filings(cls, filings: list[dict]) -> 'FilingColumns':
+        """Build columns from raw filing dicts."""
+        columns = cls()
+        for filing in filings:
+            columns.append(filing)
+        return columns
+
+    def append(self, filing: Mapping) -> None:
+        """Append a raw filing dict."""
+        self.val.append(float(filing['val']))
+        self.start.append(_day(filing.get('start')))
+        self.end.append(_day(filing.get('end')))
+        self.filed.append(_day(filing.get('filed')))
+        self.fy.append(filing.get('fy') or 0)
+        self.fp.append(filing.get('fp'))
+        self.form.append(filing.get('form'))
+        self.frame.append(_intern(filing.get('frame')))
+        self.accn.append(_intern(filing.get('accn')))
+
+    def __len__(self) -> int:
+        return len(self.val)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('filing index out of range')
+        return FilingRow(self, i)
+
+    def to_filings(self) -> list[dict]:
+        """Convert back into raw filing dicts."""
+        return [dict(row) for row in self]
+
+
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# SEC frames: 'CY2024Q3' quarter, 'CY2024' year, 'CY2024Q3I' instant
+_QUARTER_FRAME = re.compile(r'(CY\d{4}Q[1-4])I?')
+_ANNUAL_FRAME = re.compile(r'(CY\d{4})(?:Q4I)?')
+
+Period = str | date | tuple[int, str, str]
+
+
+def _date_key(value: str | date) -> str:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+class PeriodIndex:
+    """Lookups into a metric's filings by period.
+
+    Filings are indexed by SEC frame, by fiscal (fy, fp, form) and by
+    period end date, plus a list sorted by end date for range queries.
+    Where several filings share a key, the index keeps:
+
+    - frame: the latest filed
+    - (fy, fp, form): the latest period end, as a 10-K also reports
+      prior years under its own fiscal year, then the full year for
+      'FY' or the shortest period otherwise, e.g. a 10-Q's quarter over
+      its year-to-date value, then the latest filed
+    - end date: the shortest period, e.g. a quarter over the year
+      ending the same day, then the latest filed
+
+    Args:
+        filings (Sequence[Mapping]): filing dicts or `FilingColumns`
+    """
+
+    __slots__ = (
+        '_filings', '_frames', '_fiscal', '_ends', '_sorted', '_calendar'
+    )
+
+    def __init__(self, filings: Sequence[Mapping]) -> None:
+        """Build lookup tables with one pass over the filings."""
+        self._filings = filings
+        self._frames: dict[str, int] = {}
+        self._fiscal: dict[tuple, int] = {}
+        self._ends: dict[str, int] = {}
+        best_fiscal: dict[tuple, tuple] = {}
+        best_end: dict[str, tuple] = {}
+        keyed: list[tuple[str, str, int]] = []
+
+        for i, filing in enumerate(filings):
+            end = filing.get('end')
+            filed = filing.get('filed') or ''
+            frame = filing.get('frame')
+            if frame is not None:
+                # Instant frames carry an 'I' suffix, index without it
+                frame = frame.removesuffix('I')
+                j = self._frames.get(frame)
+                if j is None or filed >= (filings[j].get('filed') or ''):
+                    self._frames[frame] = i
+            if end is None:
+                continue
+            keyed.append((end, filed, i))
+
+            start = filing.get('start')
+            days = 0 if start is None else (
+                date.fromisoformat(end) - date.fromisoformat(start)
+            ).days
+
+            fp = filing.get('fp')
+            fiscal = (filing.get('fy'), fp, filing.get('form'))
+            rank = (end, days if fp == 'FY' else -days, filed)
+            if fiscal not in best_fiscal or rank >= best_fiscal[fiscal]:
+                best_fiscal[fiscal] = rank
+                self._fiscal[fiscal] = i
+
+            rank = (-days, filed)
+            if end not in best_end or rank >= best_end[end]:
+                best_end[end] = rank
+                self._ends[end] = i
+
+        keyed.sort()
+        self._sorted = keyed
+        self._calendar: dict[bool, dict[str, Mapping]] = {}
+
+    def __repr__(self) -> str:
+        return f'PeriodIndex(filings={len(self._filings)})'
+
+    def _position(self, period: Period) -> int | None:
+        if isinstance(period, tuple):
+            return self._fiscal.get(period)
+        if isinstance(period, date):
+            return self._ends.get(period.isoformat())
+        if _ISO_DATE.fullmatch(period):
+            return self._ends.get(period)
+        return self._frames.get(period.removesuffix('I'))
+
+    def at(self, period: Period) -> Mapping:
+        """Get the filing for a period.
+
+        Args:
+            period: SEC frame e.g. 'CY2024Q3', fiscal key e.g.
+                (2024, 'Q3', '10-Q'), or period end as `date` or ISO string
+        Raises:
+            KeyError: if no filing matches
+        """
+        i = self._position(period)
+        if i is None:
+            raise KeyError(period)
+        return self._filings[i]
+
+    def get(self, period: Period, default=None):
+        """Get the filing for a period, or `default`."""
+        i = self._position(period)
+        return default if i is None else self._filings[i]
+
+    def between(self, start: str | date, end: str | date) -> list[Mapping]:
+        """Get filings with period end in [start, end], oldest first."""
+        lo = bisect_left(self._sorted, (_date_key(start),))
+        hi = bisect_right(self._sorted, (_date_key(end), '\uffff'))
+        return [self._filings[i] for _, _, i in self._sorted[lo:hi]]
+
+    def calendar(self, annual: bool = False) -> dict[str, Mapping]:
+        """Get filings keyed by SEC calendar period, oldest first.
+
+        Quarters come from quarterly and instant frames, e.g. 'CY2024Q3'.
+        Years come from annual frames, with balance sheet values taken
+        at the end of Q4. The latest filed wins where several match.
+
+        Args:
+            annual (bool): key by year, e.g. 'CY2024', instead of quarter
+        """
+        periods = self._calendar.get(annual)
+        if periods is not None:
+            return periods
+        pattern = _ANNUAL_FRAME if annual else _QUARTER_FRAME
+        positions: dict[str, int] = {}
+        for i, filing in enumerate(self._filings):
+            match = pattern.fullmatch(filing.get('frame') or '')
+            if match is None:
+                continue
+            period = match.group(1)
+            j = positions.get(period)
+            filed = filing.get('filed') or ''
+            if j is None or filed >= (self._filings[j].get('filed') or ''):
+                positions[period] = i
+        periods = self._calendar[annual] = {
+            period: self._filings[positions[period]]
+            for period in sorted(positions)
+        }
+        return periods
+
+
 @dataclass
 class Metric:
-    """Container for a parsed metric and metadata."""
+    """Container for a parsed metric and metadata.
+
+    `filings` is a list of raw filing dicts, or `FilingColumns` when the
+    metric was parsed in compact form. `at`, `between` and `calendar` look
+    filings up through a `PeriodIndex` built on first use, so don't modify
+    `filings` after querying it.
+    """
     label: str
     description: str
     unit: str
-    filings: list[dict] = field(default_factory=list)
+    filings: list[dict] | FilingColumns = field(default_factory=list)
+    _index: PeriodIndex | None = field(
+        default = None, init = False, repr = False, compare = False
+    )
 
     def __repr__(self) -> str:
         return f"Metric(label='{self.label}')"
@@ -77,3 +602,120 @@ class Metric:
     def __len__(self) -> int:
         return len(self.filings)
 
+    @property
+    def index(self) -> PeriodIndex:
+        """Period index over filings, built on first use."""
+        if self._index is None:
+            self._index = PeriodIndex(self.filings)
+        return self._index
+
+    def at(self, period: Period) -> Mapping:
+        """Get the filing for a frame, fiscal key or end date.
+
+        See `PeriodIndex.at`.
+        """
+        return self.index.at(period)
+
+    def between(self, start: str | date, end: str | date) -> list[Mapping]:
+        """Get filings with period end in [start, end], oldest first."""
+        return self.index.between(start, end)
+
+    def calendar(self, annual: bool = False) -> dict[str, Mapping]:
+        """Get filings keyed by SEC calendar period, oldest first.
+
+        See `PeriodIndex.calendar`.
+        """
+        return self.index.calendar(annual)
+
+    def compact(self) -> 'Metric':
+        """Get a copy of this metric with filings stored as columns."""
+        if isinstance(self.filings, FilingColumns):
+            return self
+        return Metric(
+            label = self.label,
+            description = self.description,
+            unit = self.unit,
+            filings = FilingColumns.from_filings(self.filings)
+        )
+
+
+@dataclass
+class StatementTable:
+    """Statement metrics aligned on calendar period.
+
+    Columns are SEC calendar periods in ascending order, e.g. 'CY2024Q3'
+    for quarters or 'CY2024' for years. Each row in `values` holds one
+    concept's value per period, None where it wasn't reported.
+    """
+    periods: list[str] = field(default_factory=list)
+    ends: list[str | None] = field(default_factory=list)
+    values: dict[str, list] = field(default_factory=dict)
+    filed: list[str | None] = field(default_factory=list)
+    form: list[str | None] = field(default_factory=list)
+
+    def __repr__(self) -> str:
+        return (
+            f'StatementTable(periods={len(self.periods)}, '
+            f'concepts={len(self.values)})'
+        )
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def column(self, i: int) -> dict:
+        """Get one period in the same shape as `Company.statement`."""
+        column = {concept: row[i] for concept, row in self.values.items()}
+        column['Filed'] = self.filed[i]
+        column['Form'] = self.form[i]
+        return column
+
+    def period(self, period: str) -> dict:
+        """Get a period by name, e.g. 'CY2024Q3'."""
+        try:
+            return self.column(self.periods.index(period))
+        except ValueError as e:
+            raise KeyError(period) from e
+
+    def rows(self) -> Iterator[dict]:
+        """Iterate periods oldest first, with their period and end date."""
+        for i, period in enumerate(self.periods):
+            yield {'Period': period, 'End': self.ends[i], **self.column(i)}
+
+
+@dataclass
+class RatioTable:
+    """Ratio time series aligned on calendar period.
+
+    Each entry in `values` is a float array holding one value per period
+    in `periods`, NaN where an input wasn't reported.
+    """
+    periods: list[str] = field(default_factory=list)
+    values: dict[str, array] = field(default_factory=dict)
+
+    def __repr__(self) -> str:
+        return (
+            f'RatioTable(periods={len(self.periods)}, '
+            f'ratios={len(self.values)})'
+        )
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def series(self, name: str) -> dict[str, float]:
+        """Get one ratio by period, leaving out missing values."""
+        return {
+            period: value
+            for period, value in zip(
+                self.periods, self.values[name], strict=True
+            )
+            if not math.isnan(value)
+        }
+
+    def rows(self) -> Iterator[dict]:
+        """Iterate periods oldest first, None where a ratio is missing."""
+        for i, period in enumerate(self.periods):
+            row: dict = {'Period': period}
+            for name, values in self.values.items():
+                value = values[i]
+                row[name] = None if math.isnan(value) else value
+            yield row
@@ -1,38 +1,626 @@
-"""Networking utilities for secfilr using requests library."""
+"""Networking utilities for secfilr using requests library.
 
+All requests go through an `HTTPClient`, which keeps connections alive
+in a pooled session, paces requests with a token bucket to stay within
+SEC EDGAR's fair-access limit, and retries throttled or failed requests.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Protocol
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from secfilr import instrument
 from secfilr.exceptions import DownloadError, RequestError
 
+# SEC EDGAR fair-access policy: at most 10 requests per second
+EDGAR_RATE_LIMIT = 10.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    Args:
+        rate (float): tokens added per second
+        burst (int): bucket capacity
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """Initialize a full bucket."""
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate and burst must be positive')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Parse a Retry-After header into seconds."""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - time.time())
+
+
+class HTTPClient:
+    """Pooled, rate-limited HTTP client with retries.
+
+    Args:
+        rate_limit (float): maximum requests per second
+        burst (int): requests allowed back to back before pacing
+        pool_size (int): keep-alive connections per host
+        max_retries (int): retries for throttled or failed requests
+        backoff (float): base seconds for exponential backoff
+        max_backoff (float): upper bound for any single wait
+        timeout (float): seconds before a connection or read times out
+    """
+
+    RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        rate_limit: float = EDGAR_RATE_LIMIT,
+        burst: int = 1,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 60.0,
+        timeout: float = 30.0
+    ) -> None:
+        """Initialize session, connection pool and rate limiter."""
+        self.limiter = RateLimiter(rate_limit, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections = pool_size,
+            pool_maxsize = pool_size
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __repr__(self) -> str:
+        return f'HTTPClient(rate_limit={self.limiter.rate})'
+
+    def _should_retry(self, response: requests.Response) -> bool:
+        """Check if a response is worth retrying."""
+        if response.status_code in self.RETRY_STATUS:
+            return True
+        # EDGAR signals rate limiting with 403 and a Retry-After header
+        return (
+            response.status_code == 403
+            and 'Retry-After' in response.headers
+        )
+
+    def _delay(
+        self,
+        attempt: int,
+        response: requests.Response | None
+    ) -> float:
+        """Seconds to wait before the next attempt."""
+        delay = None if response is None else _retry_after(response)
+        if delay is None:
+            delay = self.backoff * 2 ** attempt
+        return min(delay, self.max_backoff)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """Send a request, raising for unsuccessful status codes."""
+        with instrument.span('network', url) as span:
+            response = self._send(method, url, headers, params, stream)
+            if not stream:
+                span.nbytes = len(response.content)
+            return response
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None,
+        params: dict[str, str] | None,
+        stream: bool
+    ) -> requests.Response:
+        """Send a request with rate limiting and retries."""
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.request(
+                    method = method,
+                    url = url,
+                    headers = headers,
+                    params = params,
+                    stream = stream,
+                    timeout = self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._delay(attempt, None))
+                attempt += 1
+                continue
+
+            if attempt < self.max_retries and self._should_retry(response):
+                delay = self._delay(attempt, response)
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                response.close()
+                raise
+            return response
+
+    def get(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, str] | None = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """Send a GET request, raising for unsuccessful status codes."""
+        return self.request('GET', url, headers, params, stream)
+
+    def head(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None
+    ) -> requests.Response:
+        """Send a HEAD request, raising for unsuccessful status codes."""
+        return self.request('HEAD', url, headers)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+
+_default_client: HTTPClient | None = None
+_default_client_lock = threading.Lock()
+
+
+def default_client() -> HTTPClient:
+    """Get the process-wide client, creating it on first use."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
+
+
+def set_default_client(client: HTTPClient) -> None:
+    """Replace the process-wide client, e.g. to change the rate limit."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
 
 def make_request(
     url: str,
     headers: dict[str, str] | None = None,
-    params: dict[str, str] | None = None
+    params: dict[str, str] | None = None,
+    client: HTTPClient | None = None
 ) -> str:
     """Make a request wrapped with error handling."""
+    client = client or default_client()
     try:
-        response = requests.get(url=url, headers=headers, params=params)
-        response.raise_for_status()
+        response = client.get(url=url, headers=headers, params=params)
         return response.text
     except Exception as e:
         raise RequestError('Error encountered during request') from e
 
 
-def download_files(
+@dataclass
+class DownloadState:
+    """HTTP validators and progress for a downloaded file."""
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int | None = None
+    complete: bool = False
+    sha256: str | None = None
+
+    @property
+    def validator(self) -> str | None:
+        """Strongest validator available for conditional requests."""
+        return self.etag or self.last_modified
+
+
+@dataclass
+class Progress:
+    """Download progress snapshot passed to progress callbacks."""
+    name: str
+    bytes_done: int
+    total: int | None
+    elapsed: float
+    rate: float
+    eta: float | None
+    done: bool = False
+
+    def __repr__(self) -> str:
+        total = '?' if self.total is None else self.total
+        return (
+            f"Progress(name='{self.name}', {self.bytes_done}/{total} bytes, "
+            f'{self.rate / 1e6:.2f} MB/s)'
+        )
+
+
+class _ProgressMeter:
+    """Thread-safe byte counter reporting to a progress callback.
+
+    Callbacks are throttled to one per `interval` seconds, plus one when
+    the download finishes. Rate and ETA only count bytes transferred in
+    this session, not bytes resumed from a partial file.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        total: int | None,
+        callback: Callable[[Progress], None] | None,
+        offset: int = 0,
+        interval: float = 0.5
+    ) -> None:
+        self.name = name
+        self.total = total
+        self.callback = callback
+        self.offset = offset
+        self.interval = interval
+        self.transferred = 0
+        self._start = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def _snapshot(self, done: bool) -> Progress:
+        elapsed = max(time.monotonic() - self._start, 1e-9)
+        rate = self.transferred / elapsed
+        bytes_done = self.offset + self.transferred
+        eta = None
+        if self.total is not None and rate > 0:
+            eta = max(self.total - bytes_done, 0) / rate
+        return Progress(
+            name = self.name,
+            bytes_done = bytes_done,
+            total = self.total,
+            elapsed = elapsed,
+            rate = rate,
+            eta = eta,
+            done = done
+        )
+
+    def advance(self, nbytes: int) -> None:
+        if self.callback is None:
+            return
+        with self._lock:
+            self.transferred += nbytes
+            now = time.monotonic()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            progress = self._snapshot(done=False)
+        self.callback(progress)
+
+    def finish(self) -> None:
+        if self.callback is not None:
+            self.callback(self._snapshot(done=True))
+
+
+class _Digest(Protocol):
+    """Incremental hash, as returned by `hashlib.sha256`."""
+
+    def update(self, data: bytes, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+def _hash_prefix(path: Path, nbytes: int) -> _Digest:
+    """Start a SHA-256 over the first `nbytes` of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        remaining = nbytes
+        while remaining:
+            block = f.read(min(remaining, 1048576))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def _total_size(response: requests.Response) -> int | None:
+    """Full size of a file from Content-Range or Content-Length."""
+    content_range = response.headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+def fetch_file(
     url: str,
     dest_path: Path,
-    headers: dict[str, str] | None = None
-) -> None:
-    """File downloader wrapped with error handling."""
+    state: DownloadState | None = None,
+    headers: dict[str, str] | None = None,
+    client: HTTPClient | None = None,
+    on_start: Callable[[DownloadState], None] | None = None,
+    chunk_size: int = 65536,
+    on_progress: Callable[[Progress], None] | None = None
+) -> DownloadState | None:
+    """Download a file, skipping it if unchanged and resuming if partial.
+
+    Data is streamed into `<dest_path>.part`, which replaces `dest_path`
+    once complete. A SHA-256 of the file is computed as it is written.
+
+    Args:
+        url (str): file URL
+        dest_path (Path): destination file
+        state (DownloadState): state from a previous download, if any
+        headers (dict): extra request headers
+        client (HTTPClient): optional client, defaults to process-wide one
+        on_start (Callable): called with the new state before streaming,
+            so it can be saved for resuming an interrupted download
+        chunk_size (int): bytes read from the response at a time
+        on_progress (Callable): called with `Progress` while streaming
+    Returns:
+        DownloadState: for the new file, or None if unchanged
+    """
+    client = client or default_client()
+    part_path = dest_path.with_name(dest_path.name + '.part')
+    request_headers = dict(headers or {})
+    offset = 0
+
+    if state is not None and state.complete and dest_path.exists():
+        if state.etag:
+            request_headers['If-None-Match'] = state.etag
+        if state.last_modified:
+            request_headers['If-Modified-Since'] = state.last_modified
+    elif (
+        state is not None
+        and state.validator
+        and part_path.exists()
+        and part_path.stat().st_size > 0
+    ):
+        offset = part_path.stat().st_size
+        request_headers['Range'] = f'bytes={offset}-'
+        request_headers['If-Range'] = state.validator
+
     try:
-        with requests.get(url=url, headers=headers, stream=True) as r:
-            r.raise_for_status()
-            with open(dest_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
+        with client.get(url=url, headers=request_headers, stream=True) as r:
+            if r.status_code == 304:
+                return None
+            if r.status_code != 206:
+                offset = 0
+            new_state = DownloadState(
+                etag = r.headers.get('ETag'),
+                last_modified = r.headers.get('Last-Modified'),
+                size = _total_size(r)
+            )
+            if on_start is not None:
+                on_start(new_state)
+            if offset:
+                digest = _hash_prefix(part_path, offset)
+            else:
+                digest = hashlib.sha256()
+            meter = _ProgressMeter(
+                dest_path.name, new_state.size, on_progress, offset
+            )
+            with open(part_path, 'r+b' if offset else 'wb') as f:
+                f.seek(offset)
+                f.truncate()
+                for chunk in r.iter_content(chunk_size=chunk_size):
                     f.write(chunk)
+                    digest.update(chunk)
+                    meter.advance(len(chunk))
+    except requests.HTTPError as e:
+        if offset and e.response is not None and (
+            e.response.status_code == 416
+        ):
+            # Partial file is unusable, start over
+            part_path.unlink(missing_ok=True)
+            return fetch_file(
+                url, dest_path, None, headers, client, on_start, chunk_size,
+                on_progress
+            )
+        raise DownloadError('Error encountered during download') from e
+    except Exception as e:
+        raise DownloadError('Error encountered during download') from e
+
+    size = part_path.stat().st_size
+    if new_state.size is not None and size != new_state.size:
+        raise DownloadError(
+            f'Incomplete download: {size} of {new_state.size} bytes'
+        )
+    new_state.size = size
+    new_state.sha256 = digest.hexdigest()
+    new_state.complete = True
+    part_path.replace(dest_path)
+    meter.finish()
+    return new_state
+
+
+def _fetch_segment(
+    url: str,
+    part_path: Path,
+    first: int,
+    last: int,
+    validator: str | None,
+    headers: dict[str, str],
+    client: HTTPClient,
+    chunk_size: int,
+    meter: _ProgressMeter
+) -> None:
+    """Download bytes `first`-`last` into their place in `part_path`."""
+    request_headers = {**headers, 'Range': f'bytes={first}-{last}'}
+    if validator:
+        request_headers['If-Range'] = validator
+    with client.get(url=url, headers=request_headers, stream=True) as r:
+        if r.status_code != 206:
+            raise DownloadError('File changed during segmented download')
+        with open(part_path, 'r+b') as f:
+            f.seek(first)
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                meter.advance(len(chunk))
+            written = f.tell() - first
+    if written != last - first + 1:
+        raise DownloadError(
+            f'Incomplete segment: {written} of {last - first + 1} bytes'
+        )
+
+
+def fetch_file_segmented(
+    url: str,
+    dest_path: Path,
+    state: DownloadState | None = None,
+    headers: dict[str, str] | None = None,
+    client: HTTPClient | None = None,
+    on_start: Callable[[DownloadState], None] | None = None,
+    chunk_size: int = 1048576,
+    segments: int = 4,
+    on_progress: Callable[[Progress], None] | None = None
+) -> DownloadState | None:
+    """Download a file over several connections using ranged requests.
+
+    The file is preallocated, then each segment is written in place by
+    its own worker. Every segment is a separate request through the
+    client's rate limiter. Falls back to `fetch_file` if the server
+    doesn't support ranges. Segments arrive out of order, so the SHA-256
+    is computed by reading the file back once it is complete.
+
+    Args:
+        url (str): file URL
+        dest_path (Path): destination file
+        state (DownloadState): state from a previous download, if any
+        headers (dict): extra request headers
+        client (HTTPClient): optional client, defaults to process-wide one
+        on_start (Callable): called with the new state before downloading
+        chunk_size (int): bytes read from each response at a time
+        segments (int): number of parallel connections
+        on_progress (Callable): called with `Progress` while downloading
+    Returns:
+        DownloadState: for the new file, or None if unchanged
+    """
+    client = client or default_client()
+    headers = dict(headers or {})
+    try:
+        with client.head(url=url, headers=headers) as r:
+            new_state = DownloadState(
+                etag = r.headers.get('ETag'),
+                last_modified = r.headers.get('Last-Modified'),
+                size = _total_size(r)
+            )
+            accepts_ranges = r.headers.get('Accept-Ranges') == 'bytes'
     except Exception as e:
         raise DownloadError('Error encountered during download') from e
 
+    if (
+        state is not None
+        and state.complete
+        and dest_path.exists()
+        and state.validator is not None
+        and state.validator == new_state.validator
+    ):
+        return None
+    if segments < 2 or not accepts_ranges or not new_state.size:
+        return fetch_file(
+            url, dest_path, state, headers, client, on_start, chunk_size,
+            on_progress
+        )
+
+    size = new_state.size
+    bounds = [size * i // segments for i in range(segments + 1)]
+    ranges = [
+        (first, last - 1)
+        for first, last in zip(bounds, bounds[1:], strict=False)
+        if last > first
+    ]
+    part_path = dest_path.with_name(dest_path.name + '.part')
+    if on_start is not None:
+        on_start(new_state)
+    meter = _ProgressMeter(dest_path.name, size, on_progress)
+    try:
+        with open(part_path, 'wb') as f:
+            f.truncate(size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+            futures = [
+                executor.submit(
+                    _fetch_segment, url, part_path, first, last,
+                    new_state.validator, headers, client, chunk_size, meter
+                )
+                for first, last in ranges
+            ]
+            for future in futures:
+                future.result()
+    except DownloadError:
+        raise
+    except Exception as e:
+        raise DownloadError('Error encountered during download') from e
+
+    if part_path.stat().st_size != size:
+        raise DownloadError('Segmented download size mismatch')
+    try:
+        new_state.sha256 = _hash_prefix(part_path, size).hexdigest()
+    except OSError as e:
+        raise DownloadError('Error encountered during download') from e
+    new_state.complete = True
+    part_path.replace(dest_path)
+    meter.finish()
+    return new_state
+
+
+def download_files(
+    url: str,
+    dest_path: Path,
+    headers: dict[str, str] | None = None,
+    client: HTTPClient | None = None
+) -> None:
+    """File downloader wrapped with error handling."""
+    fetch_file(url=url, dest_path=dest_path, headers=headers, client=client)
@@ -3,8 +3,18 @@
 Parse concepts into categorized metrics defined by secfilr.
 """
 
-from secfilr._models import Metric
-from secfilr.exceptions import ParsingError
+from secfilr import _xbrl_labels, instrument
+from secfilr._models import FilingColumns, Metric
+from secfilr.exceptions import InvalidMetric, ParsingError
+
+
+def metric_labels(metric: str) -> tuple[str]:
+    """Get XBRL labels for a metric key from `_xbrl_labels.map_arg`."""
+    try:
+        section, label = _xbrl_labels.map_arg[metric]
+        return _xbrl_labels.statements[section][label]
+    except KeyError as e:
+        raise InvalidMetric(f'{metric} is undefined') from e
 
 
 class ParseMetric:
@@ -28,8 +38,21 @@ class ParseMetric:
             raise ParsingError('Filing data not found.')
         return next(iter(units_dict))
 
-    def parse(self, xbrl_mapping: tuple[str]) -> Metric:
-        """Get parsed Concept from an xbrl_mapping."""
+    def parse(
+        self,
+        xbrl_mapping: tuple[str],
+        compact: bool = False
+    ) -> Metric:
+        """Get parsed Concept from an xbrl_mapping.
+
+        Args:
+            xbrl_mapping (tuple[str]): XBRL labels, most relevant first
+            compact (bool): store filings as `FilingColumns`
+        """
+        with instrument.span('parse', xbrl_mapping[0]):
+            return self._parse(xbrl_mapping, compact)
+
+    def _parse(self, xbrl_mapping: tuple[str], compact: bool) -> Metric:
         concept: dict = self._map_to_metric(xbrl_mapping)
         label: str = concept.get('label', '')
         description: str = concept.get('description', '')
@@ -39,6 +62,10 @@ class ParseMetric:
         concept_files_parsed = [
             f for f in concept_files if 'frame' in f.keys()
         ]
+        if compact:
+            concept_files_parsed = FilingColumns.from_filings(
+                concept_files_parsed
+            )
         return Metric(
             label = label,
             description = description,
@@ -19,6 +19,11 @@ labels_total_assets = (
     'LiabilitiesAndStockholdersEquity',
 )
 
+# Current Assets
+labels_current_assets = (
+    'AssetsCurrent',
+)
+
 # Cash and Cash Equivalents
 labels_cash_equiv = (
     'CashAndCashEquivalentsAtCarryingValue',
@@ -116,6 +121,11 @@ labels_total_liabilities = (
     'LiabilitiesCurrent',
 )
 
+# Current Liabilities
+labels_current_liabilities = (
+    'LiabilitiesCurrent',
+)
+
 # Stockholders' Equity
 labels_stockholders_equity = (
     'StockholdersEquity',
@@ -251,6 +261,7 @@ labels_eps_diluted = (
 balance_sheet = {
     'Shares Outstanding': labels_shares_outstanding,
     'Assets': labels_total_assets,
+    'Current Assets': labels_current_assets,
     'Cash & Equivalents': labels_cash_equiv,
     'Accounts Payable': labels_acc_payable,
     'Accounts Receivable': labels_acc_receivable,
@@ -262,6 +273,7 @@ balance_sheet = {
     'Shortterm Debt': labels_short_term_debt,
     'Longterm Debt': labels_long_term_debt,
     'Total Liabilities': labels_total_liabilities,
+    'Current Liabilities': labels_current_liabilities,
     'Stockholders Equity': labels_stockholders_equity
 }
 
@@ -296,6 +308,7 @@ statements = {
 map_arg = {
     'shares':   ('Balance Sheet', 'Shares Outstanding'),
     'assets':   ('Balance Sheet', 'Assets'),
+    'cassets':  ('Balance Sheet', 'Current Assets'),
     'cash':     ('Balance Sheet', 'Cash & Equivalents'),
     'apay':     ('Balance Sheet', 'Accounts Payable'),
     'arec':     ('Balance Sheet', 'Accounts Receivable'),
@@ -307,6 +320,7 @@ map_arg = {
     'sdebt':    ('Balance Sheet', 'Shortterm Debt'),
     'ldebt':    ('Balance Sheet', 'Longterm Debt'),
     'liab':     ('Balance Sheet', 'Total Liabilities'),
+    'cliab':    ('Balance Sheet', 'Current Liabilities'),
     'equity':   ('Balance Sheet', 'Stockholders Equity'),
     'ocf':      ('Cash Flow Statement', 'Operating Cash Flow'),
     'netcashf': ('Cash Flow Statement', 'Net Cash: Financing'),
@@ -0,0 +1,350 @@
+"""Command line export of statements and metrics.
+
+Companies are processed by a pool of workers and their rows are written
+as each company finishes, so an export of every company holds only a
+few companies in memory at a time. Rows are in long form, one value per
+row, so CSV columns are the same for every statement and metric:
+
+    secfilr AAPL MSFT --statement income --metric cash -o out.csv
+    secfilr all --source zip --annual --last 5 -o out.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from pathlib import Path
+from typing import TextIO
+
+from secfilr import _xbrl_labels
+from secfilr.company import Company, StatementType
+from secfilr.exceptions import ParsingError, SECfilrError
+from secfilr.fetch import Fetch, FetchBulk, FetchRequest, FetchZip
+
+FIELDS = (
+    'ticker', 'cik', 'item', 'period', 'end', 'value', 'form', 'filed'
+)
+
+STATEMENTS = {
+    'balance': StatementType.BALANCE_SHEET,
+    'income': StatementType.INCOME_STATEMENT,
+    'cash': StatementType.CASH_FLOW_STATEMENT,
+}
+
+# Fetcher used by the worker functions, set per process or shared
+# between threads
+_fetcher: Fetch | None = None
+
+
+def _set_fetcher(factory: Callable[[], Fetch]) -> None:
+    global _fetcher
+    _fetcher = factory()
+
+
+def _fetcher_factory(args: argparse.Namespace) -> Callable[[], Fetch]:
+    """Build a picklable fetcher constructor from the arguments."""
+    bulkdata: Path = args.bulkdata
+    options = {
+        'lazy': True,
+        'json_backend': args.json_backend,
+    }
+    if args.source == 'request':
+        return partial(FetchRequest, args.user_agent, **options)
+    if args.source == 'zip':
+        return partial(
+            FetchZip,
+            bulkdata / 'company_tickers.json',
+            bulkdata / 'companyfacts.zip',
+            **options
+        )
+    return partial(
+        FetchBulk,
+        bulkdata / 'company_tickers.json',
+        bulkdata / 'companyfacts',
+        **options
+    )
+
+
+def _statement_rows(
+    company: Company,
+    statement_t: StatementType,
+    annual: bool,
+    last: int | None
+) -> Iterator[dict]:
+    table = company.statements(statement_t, annual=annual, last=last)
+    for concept, values in table.values.items():
+        for i, value in enumerate(values):
+            if value is None:
+                continue
+            yield {
+                'item': f'{statement_t}: {concept}',
+                'period': table.periods[i],
+                'end': table.ends[i],
+                'value': value,
+                'form': table.form[i],
+                'filed': table.filed[i],
+            }
+
+
+def _metric_rows(
+    company: Company,
+    metric: str,
+    annual: bool,
+    last: int | None
+) -> Iterator[dict]:
+    """Read a metric's filings aligned on calendar period."""
+    try:
+        by_period = company.metric(metric).calendar(annual)
+    except ParsingError:
+        return
+    periods = list(by_period)
+    if last is not None:
+        periods = periods[-last:] if last > 0 else []
+    for period in periods:
+        filing = by_period[period]
+        yield {
+            'item': metric,
+            'period': period,
+            'end': filing.get('end'),
+            'value': filing.get('val'),
+            'form': filing.get('form'),
+            'filed': filing.get('filed'),
+        }
+
+
+def export_company(
+    ticker: str,
+    statements: Iterable[str],
+    metrics: Iterable[str],
+    annual: bool = False,
+    last: int | None = None
+) -> list[dict]:
+    """Build the export rows for one company, in a worker.
+
+    Args:
+        ticker (str): company ticker symbol
+        statements (Iterable[str]): keys of `STATEMENTS`
+        metrics (Iterable[str]): metric keys, e.g. 'revenue'
+        annual (bool): use years instead of quarters
+        last (int): keep only the most recent periods
+    Returns:
+        list[dict]: rows with the keys in `FIELDS`
+    """
+    company = Company(ticker, _fetcher)
+    rows = []
+    for statement in statements:
+        rows.extend(
+            _statement_rows(company, STATEMENTS[statement], annual, last)
+        )
+    for metric in metrics:
+        rows.extend(_metric_rows(company, metric, annual, last))
+    for row in rows:
+        row['ticker'] = ticker
+        row['cik'] = company.cik
+    return rows
+
+
+def _all_tickers(fetcher: Fetch) -> list[str]:
+    """Get one ticker per company, SEC lists primary classes first."""
+    tickers: dict[int, str] = {}
+    for entry in fetcher.cik_index():
+        tickers.setdefault(entry.cik, entry.ticker)
+    return list(tickers.values())
+
+
+def _run(
+    executor: Executor,
+    work: Callable[[str], list[dict]],
+    tickers: list[str],
+    in_flight: int
+) -> Iterator[tuple[str, list[dict] | None, BaseException | None]]:
+    """Yield results as they finish, with a bounded number queued."""
+    tickers_iter = iter(tickers)
+    pending: dict[Future, str] = {}
+
+    def submit() -> None:
+        for ticker in tickers_iter:
+            pending[executor.submit(work, ticker)] = ticker
+            if len(pending) >= in_flight:
+                return
+
+    submit()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            ticker = pending.pop(future)
+            error = future.exception()
+            yield ticker, None if error else future.result(), error
+        submit()
+
+
+class _Writer:
+    """Write rows as CSV or JSON Lines."""
+
+    def __init__(self, stream: TextIO, fmt: str) -> None:
+        self.stream = stream
+        self.csv = None
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        if self.csv is not None:
+            self.csv.writerows(rows)
+        else:
+            for row in rows:
+                self.stream.write(json.dumps({f: row[f] for f in FIELDS}))
+                self.stream.write('\n')
+        self.stream.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog = 'secfilr',
+        description = 'Export statements and metrics for many companies.',
+        fromfile_prefix_chars = '@'
+    )
+    parser.add_argument(
+        'tickers',
+        nargs = '+',
+        help = "ticker symbols, 'all', or @file with one per line"
+    )
+    parser.add_argument(
+        '--source',
+        choices = ('bulk', 'zip', 'request'),
+        default = 'bulk',
+        help = 'read unzipped bulk data, companyfacts.zip, or EDGAR'
+    )
+    parser.add_argument(
+        '--bulkdata',
+        type = Path,
+        default = Path('bulkdata'),
+        help = 'Downloader bulkdata directory (default: ./bulkdata)'
+    )
+    parser.add_argument(
+        '--user-agent',
+        help = 'EDGAR User-Agent, required with --source request'
+    )
+    parser.add_argument(
+        '-s', '--statement',
+        dest = 'statements',
+        action = 'append',
+        choices = sorted(STATEMENTS),
+        default = [],
+        help = 'statement to export, repeatable'
+    )
+    parser.add_argument(
+        '-m', '--metric',
+        dest = 'metrics',
+        action = 'append',
+        default = [],
+        help = 'metric key to export, e.g. revenue, repeatable'
+    )
+    parser.add_argument(
+        '--annual',
+        action = 'store_true',
+        help = 'use years instead of quarters'
+    )
+    parser.add_argument(
+        '--last',
+        type = int,
+        help = 'keep only the most recent periods'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        type = Path,
+        help = 'output file, default stdout'
+    )
+    parser.add_argument(
+        '-f', '--format',
+        choices = ('csv', 'jsonl'),
+        help = 'output format, default from output suffix, else csv'
+    )
+    parser.add_argument(
+        '-w', '--workers',
+        type = int,
+        help = 'worker processes, or threads with --source request'
+    )
+    parser.add_argument(
+        '--json-backend',
+        help = "JSON backend, e.g. 'orjson' or 'auto'"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the export, returning 1 if any company failed."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.source == 'request' and not args.user_agent:
+        parser.error('--user-agent is required with --source request')
+    args.metrics = [m.lower() for m in args.metrics]
+    for metric in args.metrics:
+        if metric not in _xbrl_labels.map_arg:
+            parser.error(f'unknown metric: {metric}')
+    if not args.statements and not args.metrics:
+        args.statements = sorted(STATEMENTS)
+    fmt = args.format
+    if fmt is None:
+        suffix = args.output.suffix if args.output else ''
+        fmt = 'jsonl' if suffix in ('.jsonl', '.json') else 'csv'
+
+    factory = _fetcher_factory(args)
+    _set_fetcher(factory)
+    tickers = args.tickers
+    try:
+        if [t.lower() for t in tickers] == ['all']:
+            tickers = _all_tickers(_fetcher)
+    except SECfilrError as e:
+        print(f'secfilr: {e}', file=sys.stderr)
+        return 1
+
+    work = partial(
+        export_company,
+        statements = args.statements,
+        metrics = args.metrics,
+        annual = args.annual,
+        last = args.last
+    )
+    # Requests share one rate limited client, so use threads for them
+    if args.source == 'request':
+        workers = args.workers or 8
+        executor = ThreadPoolExecutor(max_workers=workers)
+    else:
+        workers = args.workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(
+            max_workers = workers,
+            initializer = _set_fetcher,
+            initargs = (factory,)
+        )
+
+    failed = 0
+    stream = (
+        open(args.output, 'w', newline='') if args.output else sys.stdout
+    )
+    try:
+        writer = _Writer(stream, fmt)
+        with executor:
+            for ticker, rows, error in _run(
+                executor, work, tickers, 4 * workers
+            ):
+                if error is not None:
+                    failed += 1
+                    print(f'secfilr: {ticker}: {error}', file=sys.stderr)
+                    continue
+                writer.write(rows)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 1 if failed else 0
@@ -2,15 +2,26 @@
 
 `Company` serves as the main interface between the API user,
 and any processing and parsing that secfilr may do.
+`iter_companies` streams every company in the bulk data.
 """
 
+from collections.abc import Iterable, Iterator, Mapping
 from enum import StrEnum
+from pathlib import Path
 
 from secfilr import _xbrl_labels
-from secfilr._models import CompanyFacts, Facts, Metric
+from secfilr._index import CIKIndex
+from secfilr._models import (
+    CompanyFacts,
+    Facts,
+    Metric,
+    StatementTable,
+    decode_companyfacts_json,
+)
 from secfilr._parse import ParseMetric as _ParseMetric
-from secfilr.exceptions import InvalidMetric, ParsingError
-from secfilr.fetch import Fetch
+from secfilr._parse import metric_labels as _metric_labels
+from secfilr.exceptions import ParsingError, SECfilrError
+from secfilr.fetch import Fetch, FetchBulk, iter_companyfacts_json
 
 
 class StatementType(StrEnum):
@@ -26,14 +37,57 @@ class Company:
     Args:
         ticker (str): company ticker symbol
         fetcher (Fetch): data fetcher
+        precompute (bool): parse all statement metrics up front
+
+    Parsed metrics are cached per set of XBRL labels, so repeated calls to
+    `metric` and `statement` only parse each metric once. Cached metrics
+    are shared between calls, copy one before modifying it.
     """
 
-    def __init__(self, ticker: str, fetcher: Fetch) -> None:
+    def __init__(
+        self,
+        ticker: str,
+        fetcher: Fetch,
+        precompute: bool = False
+    ) -> None:
         """Initialize companyfacts and parser using given fetcher."""
         companyfacts: CompanyFacts = fetcher.companyfacts(ticker)
+        self._load(companyfacts, ticker, precompute)
+
+    def _load(
+        self,
+        companyfacts: CompanyFacts,
+        ticker: str,
+        precompute: bool
+    ) -> None:
+        """Initialize companyfacts and parser."""
         self.facts: Facts = companyfacts.facts
+        self.cik = companyfacts.cik
         self.ticker = ticker.strip().upper()
         self.name = companyfacts.name
+        self._parser = _ParseMetric(self.facts.concepts)
+        self._metrics: dict[tuple, Metric | ParsingError] = {}
+        if precompute:
+            self.precompute()
+
+    @classmethod
+    def from_companyfacts(
+        cls,
+        companyfacts: CompanyFacts,
+        ticker: str = '',
+        precompute: bool = False
+    ) -> 'Company':
+        """Build from already fetched companyfacts.
+
+        Args:
+            companyfacts (CompanyFacts): decoded companyfacts
+            ticker (str): ticker symbol, defaults to the CIK
+            precompute (bool): parse all statement metrics up front
+        """
+        company = cls.__new__(cls)
+        ticker = ticker or str(companyfacts.cik)
+        company._load(companyfacts, ticker, precompute)
+        return company
 
     def __repr__(self) -> str:
         return f'SECfilr({self.ticker})'
@@ -57,25 +111,44 @@ class Company:
 
     def _get_metric_mapper(self, metric: str) -> tuple[str]:
         """Get matching tuple for metric mapping."""
-        try:
-            section, label = _xbrl_labels.map_arg[metric]
-            return _xbrl_labels.statements[section][label]
-        except KeyError as e:
-            raise InvalidMetric(f'{metric} is undefined') from e
+        return _metric_labels(metric)
 
-    def metric(self, metric: str) -> Metric:
+    def _parse(self, xbrl_mapping: tuple[str], compact: bool) -> Metric:
+        """Parse a metric, or get it from the cache."""
+        key = (xbrl_mapping, compact)
+        parsed = self._metrics.get(key)
+        if parsed is None:
+            try:
+                parsed = self._parser.parse(xbrl_mapping, compact=compact)
+            except ParsingError as e:
+                parsed = e
+            self._metrics[key] = parsed
+        if isinstance(parsed, ParsingError):
+            raise ParsingError(*parsed.args)
+        return parsed
+
+    def precompute(self, compact: bool = False) -> None:
+        """Parse and cache every statement metric."""
+        for statement in _xbrl_labels.statements.values():
+            for labels in statement.values():
+                try:
+                    self._parse(labels, compact)
+                except ParsingError:
+                    continue
+
+    def metric(self, metric: str, compact: bool = False) -> Metric:
         """Get a parsed metric.
 
         Args:
             metric (str)
+            compact (bool): store filings as typed columns
         Returns:
             Metric: dataclass for filings
         Raises:
             ParseError: if parsing fails
         """
-        parser = _ParseMetric(self.facts.concepts)
         xbrl_mapping = self._get_metric_mapper(metric.lower())
-        return parser.parse(xbrl_mapping)
+        return self._parse(xbrl_mapping, compact)
 
     def statement(
         self,
@@ -83,13 +156,12 @@ class Company:
         quarter_off: int = 0
     ) -> dict:
         """Build a statement from parsed metrics."""
-        parser = _ParseMetric(self.facts.concepts)
         statement_dict = {}
         filed, form = None, None
 
         for concept, labels in _xbrl_labels.statements[statement_t].items():
             try:
-                parsed_metric: Metric = parser.parse(labels)
+                parsed_metric: Metric = self._parse(labels, False)
                 latest_filing: dict = parsed_metric.filings[-(quarter_off+1)]
                 value = latest_filing.get('val')
                 form = latest_filing.get('form')
@@ -102,3 +174,135 @@ class Company:
 
         return statement_dict
 
+    def statements(
+        self,
+        statement_t: StatementType,
+        annual: bool = False,
+        last: int | None = None
+    ) -> StatementTable:
+        """Build a statement over every reported period, aligned by period.
+
+        Each concept's filings are read once and keyed by SEC calendar
+        frame, so every value in a column comes from the same period.
+
+        Args:
+            statement_t (StatementType)
+            annual (bool): use years instead of quarters; balance sheet
+                values are taken at the end of Q4
+            last (int): keep only the most recent periods
+        Returns:
+            StatementTable: values per concept per period
+        """
+        by_concept: dict[str, Mapping[str, Mapping]] = {}
+        for concept, labels in _xbrl_labels.statements[statement_t].items():
+            try:
+                by_concept[concept] = self._parse(labels, False).calendar(
+                    annual
+                )
+            except ParsingError:
+                by_concept[concept] = {}
+
+        periods = sorted({p for by in by_concept.values() for p in by})
+        if last is not None:
+            periods = periods[-last:] if last > 0 else []
+        table = StatementTable(periods=periods)
+        for concept, by_period in by_concept.items():
+            table.values[concept] = [
+                by_period[p].get('val') if p in by_period else None
+                for p in periods
+            ]
+        for period in periods:
+            filings = [
+                by[period] for by in by_concept.values() if period in by
+            ]
+            latest = max(filings, key=lambda f: f.get('filed') or '')
+            table.ends.append(latest.get('end'))
+            table.filed.append(latest.get('filed'))
+            table.form.append(latest.get('form'))
+        return table
+
+
+def _reports(
+    concepts: Mapping,
+    required: tuple[str, ...],
+    required_metrics: list[tuple[str]]
+) -> bool:
+    """Check a company reports every concept and every metric."""
+    return all(c in concepts for c in required) and all(
+        any(label in concepts for label in labels)
+        for labels in required_metrics
+    )
+
+
+def iter_companies(
+    source: Path,
+    company_tickers: Path | None = None,
+    concepts: Iterable[str] = (),
+    metrics: Iterable[str] = (),
+    prefetch: int = 2,
+    lazy: bool = True,
+    json_backend: str | None = None,
+    trusted: bool = False,
+    skip_errors: bool = False
+) -> Iterator[Company]:
+    """Stream every company in the bulk data, one at a time.
+
+    At most `prefetch` documents are read ahead and nothing is kept once
+    yielded, so a pass over the whole market runs in fixed memory.
+    Filters are checked against the concept names found by scanning the
+    raw text, before any concept is decoded.
+
+    Args:
+        source (Path): companyfacts directory, or companyfacts.zip
+        company_tickers (Path): company_tickers.json, to name companies
+            by ticker, otherwise they are named by CIK
+        concepts (Iterable[str]): us-gaap concepts a company must report
+        metrics (Iterable[str]): metric keys a company must report under
+            any of their labels, e.g. 'revenue'
+        prefetch (int): documents read ahead on a background thread
+        lazy (bool): decode concepts on first access
+        json_backend (str): JSON backend for full decodes, or 'auto'
+        trusted (bool): skip validating decoded data
+        skip_errors (bool): skip documents that fail to read or decode
+    Yields:
+        Company: one per companyfacts document
+    """
+    required = tuple(concepts)
+    required_metrics = [_metric_labels(m.lower()) for m in metrics]
+    tickers: dict[int, str] = {}
+    if company_tickers is not None:
+        index = CIKIndex.from_json(
+            FetchBulk._load_json(company_tickers),
+            backend = json_backend or 'stdlib',
+            trusted = trusted
+        )
+        for entry in index:
+            # First listing wins, SEC lists primary share classes first
+            tickers.setdefault(entry.cik, entry.ticker)
+
+    documents = iter_companyfacts_json(
+        source, prefetch=prefetch, skip_errors=skip_errors
+    )
+    for cik, json_str in documents:
+        try:
+            companyfacts = None
+            if required or required_metrics:
+                scanned = decode_companyfacts_json(json_str, lazy=True)
+                if not _reports(
+                    scanned.facts.concepts, required, required_metrics
+                ):
+                    continue
+                if lazy:
+                    companyfacts = scanned
+            if companyfacts is None:
+                companyfacts = decode_companyfacts_json(
+                    json_str,
+                    lazy = lazy,
+                    backend = json_backend,
+                    trusted = trusted
+                )
+        except SECfilrError:
+            if skip_errors:
+                continue
+            raise
+        yield Company.from_companyfacts(companyfacts, tickers.get(cik, ''))
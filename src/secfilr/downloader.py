@@ -1,13 +1,43 @@
 """Contains the `Downloader` class for downloading bulk filing data."""
 
 import json
+import os
 import pathlib
 import shutil
 import zipfile
+import zlib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
 
-from secfilr._network import download_files as _download_files
-from secfilr._network import make_request as _make_request
+from secfilr._index import CIKIndex, index_zip_members, member_cik
+from secfilr._network import DownloadState, HTTPClient, Progress
+from secfilr._network import fetch_file as _fetch_file
+from secfilr._network import fetch_file_segmented as _fetch_file_segmented
 from secfilr._urls import EDGAR_CIK_URL, EDGAR_ZIP_URL
+from secfilr.exceptions import DownloadError, TickerNotFound
+from secfilr.fetch import FetchBulk
+from secfilr.store import build_store, update_store
+
+
+@dataclass
+class ArchiveDelta:
+    """Companies that changed between two companyfacts.zip archives.
+
+    Args:
+        changed (set[int]): CIKs added, or whose member CRC or size changed
+        removed (set[int]): CIKs no longer in the archive
+    """
+    changed: set[int] = field(default_factory=set)
+    removed: set[int] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+    @property
+    def ciks(self) -> set[int]:
+        """Every CIK needing reprocessing."""
+        return self.changed | self.removed
 
 
 class Downloader:
@@ -16,9 +46,37 @@ class Downloader:
     Args:
         user_agent (str): EDGAR API user-agent credential
         dest_path (Path): destination directory for bulk data
+        client (HTTPClient): optional client, defaults to process-wide one
+        cik_url (str): company_tickers.json URL
+        zip_url (str): companyfacts.zip URL
+        segments (int): parallel ranged requests for companyfacts.zip
+        chunk_size (int): bytes read from a response at a time
+        progress (Callable): called with `Progress` (bytes, rate, ETA)
+            while downloading
+
+    Downloads are conditional, files unchanged since the last run are not
+    fetched again, and interrupted downloads resume where they stopped.
+    What is on disk, including each file's SHA-256, is tracked in
+    `manifest.json`.
+
+    Each companyfacts member's CRC and size is kept in `members.json`.
+    Extraction only rewrites the members that changed since the previous
+    run. After `download`, the companies changed since the store was last
+    built are in `delta`, kept in `delta.json` across runs, and
+    `build_store(ciks=downloader.delta.ciks)` updates only them.
     """
 
-    def __init__(self, user_agent: str, dest_path: pathlib.Path):
+    def __init__(
+        self,
+        user_agent: str,
+        dest_path: pathlib.Path,
+        client: HTTPClient | None = None,
+        cik_url: str = EDGAR_CIK_URL,
+        zip_url: str = EDGAR_ZIP_URL,
+        segments: int = 1,
+        chunk_size: int = 1048576,
+        progress: Callable[[Progress], None] | None = None
+    ):
         """Initialize paths."""
         # Build paths from dest_path root
         self.path_dest_dir = dest_path / 'bulkdata'
@@ -26,37 +84,303 @@ class Downloader:
         self.path_facts_zip = self.path_dest_dir / 'companyfacts.zip'
         self.path_facts_unzipped = self.path_dest_dir / 'companyfacts'
         self.path_tickers_json = self.path_dest_dir / 'company_tickers.json'
+        self.path_store = self.path_dest_dir / 'companyfacts.db'
+        self.path_manifest = self.path_dest_dir / 'manifest.json'
+        self.path_members = self.path_dest_dir / 'members.json'
+        self.path_delta = self.path_dest_dir / 'delta.json'
         # Build EDGAR API header
         self.headers = {'User-Agent': user_agent}
+        self.client = client
+        self.cik_url = cik_url
+        self.zip_url = zip_url
+        self.segments = segments
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.delta: ArchiveDelta | None = None
 
-    def _download_cik_mapping(self) -> None:
-        """Download CIK file for mapping ticker symbols."""
-        cik_data = _make_request(
-            url = EDGAR_CIK_URL,
-            headers = self.headers
+    def _load_manifest(self) -> dict[str, DownloadState]:
+        """Load the manifest of files on disk."""
+        try:
+            with open(self.path_manifest, 'r') as f:
+                raw: dict[str, dict] = json.load(f)
+            return {name: DownloadState(**s) for name, s in raw.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def _save_manifest(self, manifest: dict[str, DownloadState]) -> None:
+        """Save the manifest of files on disk."""
+        tmp_path = self.path_manifest.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({n: asdict(s) for n, s in manifest.items()}, f)
+            tmp_path.replace(self.path_manifest)
+        except OSError as e:
+            raise DownloadError(
+                f'Error writing: {self.path_manifest.resolve()}'
+            ) from e
+
+    def _load_members(self) -> tuple[list | None, dict[int, list]] | None:
+        """Load the archive key and member digests from the last run."""
+        try:
+            with open(self.path_members, 'r') as f:
+                raw = json.load(f)
+            members = {int(c): list(d) for c, d in raw['members'].items()}
+            return raw['archive'], members
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def _save_members(
+        self,
+        archive_key: list | None,
+        members: dict[int, list]
+    ) -> None:
+        """Save the archive key and member digests for the next run."""
+        tmp_path = self.path_members.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'archive': archive_key, 'members': members}, f)
+            tmp_path.replace(self.path_members)
+        except OSError as e:
+            raise DownloadError(
+                f'Error writing: {self.path_members.resolve()}'
+            ) from e
+
+    def _load_delta(self) -> ArchiveDelta:
+        """Load changes not yet applied to the store."""
+        try:
+            with open(self.path_delta, 'r') as f:
+                raw = json.load(f)
+            return ArchiveDelta(
+                changed = {int(c) for c in raw['changed']},
+                removed = {int(c) for c in raw['removed']}
+            )
+        except (OSError, ValueError, TypeError, KeyError):
+            return ArchiveDelta()
+
+    def _save_delta(self, delta: ArchiveDelta) -> None:
+        """Save changes not yet applied to the store."""
+        tmp_path = self.path_delta.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'changed': sorted(delta.changed),
+                    'removed': sorted(delta.removed),
+                }, f)
+            tmp_path.replace(self.path_delta)
+        except OSError as e:
+            raise DownloadError(
+                f'Error writing: {self.path_delta.resolve()}'
+            ) from e
+
+    def _download(
+        self,
+        url: str,
+        dest_path: pathlib.Path,
+        segments: int = 1
+    ) -> bool:
+        """Download a file unless unchanged, returning if it changed."""
+        manifest = self._load_manifest()
+        state = manifest.get(dest_path.name)
+
+        def record(new_state: DownloadState) -> None:
+            manifest[dest_path.name] = new_state
+            self._save_manifest(manifest)
+
+        kwargs = {'segments': segments} if segments > 1 else {}
+        fetch = _fetch_file_segmented if segments > 1 else _fetch_file
+        new_state = fetch(
+            url = url,
+            dest_path = dest_path,
+            state = state,
+            headers = self.headers,
+            client = self.client,
+            on_start = record,
+            chunk_size = self.chunk_size,
+            on_progress = self.progress,
+            **kwargs
         )
-        with open(self.path_tickers_json, 'w') as f:
-            json.dump(json.loads(cik_data), f)
+        if new_state is None:
+            return False
+        record(new_state)
+        return True
 
-    def _download_companyfacts_zip(self) -> None:
+    def _download_cik_mapping(self) -> bool:
+        """Download CIK file for mapping ticker symbols."""
+        return self._download(self.cik_url, self.path_tickers_json)
+
+    def _download_companyfacts_zip(self) -> bool:
         """Download the bulk companyfacts zip file."""
-        _download_files(
-            url = EDGAR_ZIP_URL,
-            headers = self.headers,
-            dest_path = self.path_facts_zip
+        changed = self._download(
+            self.zip_url,
+            self.path_facts_zip,
+            segments = self.segments
         )
+        if changed and self.segments > 1:
+            # Segments were written out of order, check every member's CRC
+            self._verify_companyfacts_zip(check_crc=True)
+        return changed
+
+    def _verify_companyfacts_zip(self, check_crc: bool = False) -> None:
+        """Validate the archive, discarding it if corrupt.
+
+        Without `check_crc` only the central directory is read, which
+        catches truncated archives without a pass over the whole file.
+        Member CRCs are still checked as they are extracted.
+        """
+        try:
+            with zipfile.ZipFile(self.path_facts_zip, 'r') as zip:
+                if check_crc:
+                    bad_member = zip.testzip()
+                else:
+                    bad_member = _check_member_bounds(
+                        zip.infolist(), self.path_facts_zip.stat().st_size
+                    )
+        except (OSError, EOFError, zipfile.BadZipFile, zlib.error) as e:
+            bad_member = str(e)
+        if bad_member is None:
+            return
+        manifest = self._load_manifest()
+        manifest.pop(self.path_facts_zip.name, None)
+        self._save_manifest(manifest)
+        self.path_facts_zip.unlink(missing_ok=True)
+        raise DownloadError(f'Corrupt companyfacts.zip: {bad_member}')
+
+    def _same_archive(self, manifest: dict[str, DownloadState]) -> bool:
+        """Check if companyfacts was extracted from the current zip."""
+        extracted = manifest.get(self.path_facts_unzipped.name)
+        archive = manifest.get(self.path_facts_zip.name)
+        if extracted is None or archive is None:
+            return False
+        return self.path_facts_unzipped.exists() and (
+            _archive_key(extracted) == _archive_key(archive)
+        )
+
+    def _resolve_universe(self, universe: Iterable[str | int]) -> set[int]:
+        """Map tickers and CIKs, as ints or digit strings, to CIKs.
+
+        Raises TickerNotFound naming every unknown ticker, so a typo
+        can't shrink the universe and prune extracted files.
+        """
+        index = CIKIndex.from_json(
+            FetchBulk._load_json(self.path_tickers_json)
+        )
+        ciks = set()
+        unknown = []
+        for item in universe:
+            if isinstance(item, str) and item.strip().isdigit():
+                item = int(item)
+            if isinstance(item, int):
+                ciks.add(item)
+            elif item in index:
+                ciks.add(index.ticker(item).cik)
+            else:
+                unknown.append(str(item))
+        if unknown:
+            raise TickerNotFound(
+                f'{", ".join(unknown)} Not found in CIK mapping data'
+            )
+        return ciks
+
+    def _unzip_companyfacts(
+        self,
+        ciks: set[int] | None = None,
+        workers: int | None = None,
+        delta: ArchiveDelta | None = None
+    ) -> None:
+        """Un-zip companyfacts, or only the members for given CIKs.
+
+        Members already extracted from the same archive are skipped, and
+        files outside a given selection are removed. With a `delta` from
+        the archive the directory was extracted from, only changed and
+        missing members are extracted.
+        """
+        manifest = self._load_manifest()
+        same_archive = self._same_archive(manifest)
+        extracted = manifest.get(self.path_facts_unzipped.name)
+        if same_archive and ciks is None and extracted.complete:
+            return
+        self._verify_companyfacts_zip()
 
-    def _unzip_companyfacts(self) -> None:
-        """Un-zip companyfacts."""
         with zipfile.ZipFile(self.path_facts_zip, 'r') as zip:
-            zip.extractall(self.path_facts_unzipped)
+            if ciks is None:
+                names = zip.namelist()
+            else:
+                members = index_zip_members(zip)
+                names = [members[c].filename for c in ciks if c in members]
+        self.path_facts_unzipped.mkdir(exist_ok=True)
+        if ciks is not None:
+            keep = set(names)
+            for path in self.path_facts_unzipped.glob('CIK*.json'):
+                if path.name not in keep:
+                    path.unlink()
+        if same_archive:
+            names = [
+                n for n in names
+                if not (self.path_facts_unzipped / n).exists()
+            ]
+        elif delta is not None:
+            names = [
+                n for n in names
+                if member_cik(n) in delta.changed
+                or not (self.path_facts_unzipped / n).exists()
+            ]
+            for cik in delta.removed:
+                path = self.path_facts_unzipped / f'CIK{cik:010d}.json'
+                path.unlink(missing_ok=True)
+        _extract_members_parallel(
+            self.path_facts_zip, names, self.path_facts_unzipped, workers
+        )
+
+        # Record which archive the directory was extracted from
+        archive = manifest.get(self.path_facts_zip.name, DownloadState())
+        manifest[self.path_facts_unzipped.name] = replace(
+            archive, complete=ciks is None
+        )
+        self._save_manifest(manifest)
+
+    def build_store(self, ciks: Iterable[int] | None = None) -> None:
+        """Build a local store for `FetchStore` from the downloaded zip.
+
+        Companies built into the store are cleared from `delta`.
+
+        Args:
+            ciks (Iterable[int]): only update these companies in an
+                existing store, e.g. `delta.ciks`
+        """
+        if ciks is not None and self.path_store.exists():
+            ciks = set(ciks)
+            update_store(
+                db_path = self.path_store,
+                company_tickers = self.path_tickers_json,
+                companyfacts = self.path_facts_zip,
+                ciks = ciks
+            )
+            pending = self._load_delta()
+            self.delta = ArchiveDelta(
+                changed = pending.changed - ciks,
+                removed = pending.removed - ciks
+            )
+        else:
+            build_store(
+                db_path = self.path_store,
+                company_tickers = self.path_tickers_json,
+                companyfacts = self.path_facts_zip
+            )
+            self.delta = ArchiveDelta()
+        self._save_delta(self.delta)
 
     def remove(self) -> None:
         """Remove all bulk data files."""
         for path in [
             self.path_tickers_json,
             self.path_facts_zip,
-            self.path_facts_unzipped
+            self.path_facts_unzipped,
+            self.path_store,
+            self.path_manifest,
+            self.path_members,
+            self.path_delta,
+            self.path_tickers_json.with_name('company_tickers.json.part'),
+            self.path_facts_zip.with_name('companyfacts.zip.part'),
         ]:
             if path.exists():
                 if path.is_dir():
@@ -64,9 +388,151 @@ class Downloader:
                 else:
                     path.unlink()
 
-    def download(self) -> None:
-        """Download CIK mapping, bulk files, and unzip companyfacts."""
-        self._download_cik_mapping()
-        self._download_companyfacts_zip()
-        self._unzip_companyfacts()
+    def download(
+        self,
+        extract: bool = True,
+        universe: Iterable[str | int] | None = None,
+        workers: int | None = None
+    ) -> bool:
+        """Download CIK mapping, bulk files, and unzip companyfacts.
+
+        Files unchanged since the last run are skipped, and only
+        companyfacts members that changed are re-extracted. Companies
+        changed since the store was last built are left in `delta`, and
+        kept on disk across runs until `build_store` applies them.
+
+        Args:
+            extract (bool): unzip companyfacts, not needed for `FetchZip`
+            universe (Iterable[str | int]): tickers or CIKs to extract,
+                defaults to every company in the archive; an unknown
+                ticker raises TickerNotFound before anything is pruned
+            workers (int): extraction processes, defaults to CPU count
+        Returns:
+            bool: True if anything was downloaded
+        """
+        tickers_changed = self._download_cik_mapping()
+        zip_changed = self._download_companyfacts_zip()
+
+        # Compare member CRCs with the last run, unless the zip is the same
+        manifest = self._load_manifest()
+        archive_key = _archive_key(manifest.get(self.path_facts_zip.name))
+        previous = self._load_members()
+        members = None
+        if (
+            previous is not None
+            and archive_key is not None
+            and previous[0] == archive_key
+        ):
+            changes = ArchiveDelta()
+        else:
+            self._verify_companyfacts_zip()
+            members = _member_digests(self.path_facts_zip)
+            changes = _diff_members(
+                previous[1] if previous else {}, members
+            )
+        # Save pending changes before the digests they were found from
+        self.delta = _merge_deltas(self._load_delta(), changes)
+        self._save_delta(self.delta)
+
+        if extract:
+            ciks = None
+            if universe is not None:
+                ciks = self._resolve_universe(universe)
+            extracted_key = _archive_key(
+                manifest.get(self.path_facts_unzipped.name)
+            )
+            incremental = (
+                previous is not None
+                and extracted_key is not None
+                and extracted_key == previous[0]
+            )
+            self._unzip_companyfacts(
+                ciks, workers, changes if incremental else None
+            )
+        if members is not None:
+            self._save_members(archive_key, members)
+        return tickers_changed or zip_changed
+
+
+def _archive_key(state: DownloadState | None) -> list | None:
+    """Identify an archive version by its HTTP validators and size."""
+    if state is None:
+        return None
+    return [state.etag, state.last_modified, state.size]
+
+
+def _member_digests(zip_path: pathlib.Path) -> dict[int, list]:
+    """Read each member's CRC and size from the central directory."""
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip:
+            return {
+                cik: [info.CRC, info.file_size]
+                for cik, info in index_zip_members(zip).items()
+            }
+    except (OSError, zipfile.BadZipFile) as e:
+        raise DownloadError(f'Error reading: {zip_path.resolve()}') from e
+
+
+def _diff_members(
+    previous: dict[int, list],
+    current: dict[int, list]
+) -> ArchiveDelta:
+    """Find members added, changed or removed between two archives."""
+    return ArchiveDelta(
+        changed = {c for c, d in current.items() if previous.get(c) != d},
+        removed = set(previous) - set(current)
+    )
+
+
+def _merge_deltas(pending: ArchiveDelta, new: ArchiveDelta) -> ArchiveDelta:
+    """Add changes from the latest archive to ones not yet applied."""
+    return ArchiveDelta(
+        changed = (pending.changed | new.changed) - new.removed,
+        removed = (pending.removed | new.removed) - new.changed
+    )
+
+
+def _check_member_bounds(
+    infos: list[zipfile.ZipInfo],
+    file_size: int
+) -> str | None:
+    """Find a member whose data would lie past the end of the file."""
+    for info in infos:
+        if info.header_offset + info.compress_size > file_size:
+            return info.filename
+    return None
+
+
+def _extract_members(
+    zip_path: pathlib.Path,
+    names: list[str],
+    dest_path: pathlib.Path
+) -> None:
+    """Extract the named members of an archive."""
+    with zipfile.ZipFile(zip_path, 'r') as zip:
+        for name in names:
+            zip.extract(name, dest_path)
+
 
+def _extract_members_parallel(
+    zip_path: pathlib.Path,
+    names: list[str],
+    dest_path: pathlib.Path,
+    workers: int | None = None
+) -> None:
+    """Extract members across worker processes, each with its own handle."""
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1 or len(names) < 2:
+            _extract_members(zip_path, names, dest_path)
+            return
+        chunks = [names[i::workers * 4] for i in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_extract_members, zip_path, chunk, dest_path)
+                for chunk in chunks if chunk
+            ]
+            for future in futures:
+                future.result()
+    except Exception as e:
+        raise DownloadError('Error extracting companyfacts') from e
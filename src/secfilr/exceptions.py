@@ -36,6 +36,11 @@ class FetchError(SECfilrError):
     pass
 
 
+class IndexUnavailable(FetchError):
+    """Raised when a fetcher has no ticker/CIK index."""
+    pass
+
+
 class ParsingError(SECfilrError):
     """Raised when the parsing of a file fails."""
     pass
@@ -1,62 +1,487 @@
 """Companyfacts data fetching."""
 
+import asyncio
+import queue
+import threading
+import time
+import zipfile
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+from secfilr import instrument
+from secfilr._cache import HTTPCache
+from secfilr._index import CIKIndex, index_zip_members, member_cik
 from secfilr._models import (
     CompanyCIK,
     CompanyFacts,
-    decode_cik_json,
+    companyfacts_nbytes,
     decode_companyfacts_json,
 )
-from secfilr._network import make_request
+from secfilr._network import HTTPClient, make_request
 from secfilr._urls import EDGAR_CIK_URL, EDGAR_FACTS_URL
-from secfilr.exceptions import FetchError
+from secfilr.exceptions import (
+    FetchError,
+    FileDecodeError,
+    IndexUnavailable,
+    RequestError,
+    SECfilrError,
+)
 
 
 class Fetch(ABC):
-    """Base class for companyfact fetchers."""
+    """Base class for companyfact fetchers.
+
+    Ticker lookups go through a `CIKIndex` that is built once per fetcher
+    and rebuilt only when the implementation reports it as stale.
+    """
+
+    _cik_index: CIKIndex | None = None
+    lazy: bool = False
+    json_backend: str | None = None
+    trusted: bool = False
 
     @abstractmethod
     def companyfacts(self, ticker: str) -> CompanyFacts:
         pass
 
+    def _decode(self, json_str: str) -> CompanyFacts:
+        """Decode companyfacts JSON using this fetcher's options."""
+        return decode_companyfacts_json(
+            json_str,
+            lazy = self.lazy,
+            backend = self.json_backend,
+            trusted = self.trusted
+        )
+
+    def _build_cik_index(self) -> CIKIndex:
+        """Build the ticker/CIK index from the fetcher's data source."""
+        raise IndexUnavailable(
+            f'{type(self).__name__} does not provide a CIK index'
+        )
+
+    def _cik_index_stale(self, index: CIKIndex) -> bool:
+        """Check whether a cached index is out of date."""
+        return False
+
+    def cik_index(self) -> CIKIndex:
+        """Get the ticker/CIK index, building it on first use."""
+        index = self._cik_index
+        if index is None or self._cik_index_stale(index):
+            index = self._cik_index = self._build_cik_index()
+        return index
+
+    def cik(self, ticker: str) -> CompanyCIK:
+        """Look up CIK data for given ticker symbol."""
+        return self.cik_index().ticker(ticker)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching companyfacts for one ticker in a batch."""
+    ticker: str
+    companyfacts: CompanyFacts | None = None
+    error: SECfilrError | None = None
+
+    def __repr__(self) -> str:
+        status = 'ok' if self.error is None else type(self.error).__name__
+        return f"FetchResult(ticker='{self.ticker}', {status})"
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _ticker_error(ticker: str, e: Exception) -> SECfilrError:
+    """Report any failure for one ticker in a batch as a `SECfilrError`."""
+    if isinstance(e, SECfilrError):
+        return e
+    error = FetchError(f'Error fetching companyfacts for {ticker!r}')
+    error.__cause__ = e
+    return error
+
+
+def _load_persisted_index(path: Path | None) -> CIKIndex | None:
+    """Load a persisted index, if there is a readable one."""
+    if path is None or not path.exists():
+        return None
+    try:
+        return CIKIndex.load(path)
+    except FileDecodeError:
+        return None
 
-class FetchBulk(Fetch):
+
+class _FetchLocal(Fetch):
+    """Base class for fetchers reading a local company_tickers.json."""
+
+    company_tickers: Path
+    index_path: Path | None = None
+
+    @staticmethod
+    def _load_json(path: Path) -> str:
+        """Load JSON file with error handling."""
+        try:
+            with instrument.span('disk', str(path)) as span:
+                with open(path, 'r') as f:
+                    text = f.read()
+                span.nbytes = len(text)
+            return text
+
+        except Exception as e:
+            raise FetchError(f'Error reading: {path.resolve()}') from e
+
+    def _tickers_mtime(self) -> float:
+        """Get modification time of company_tickers.json."""
+        try:
+            return self.company_tickers.stat().st_mtime
+        except Exception as e:
+            raise FetchError(
+                f'Error reading: {self.company_tickers.resolve()}'
+            ) from e
+
+    def _cik_index_stale(self, index: CIKIndex) -> bool:
+        """Index is stale once company_tickers.json is replaced."""
+        return self._tickers_mtime() > index.timestamp
+
+    def _build_cik_index(self) -> CIKIndex:
+        """Build index from company_tickers.json, or its persisted copy."""
+        index = _load_persisted_index(self.index_path)
+        if index is not None and not self._cik_index_stale(index):
+            return index
+        index = CIKIndex.from_json(
+            self._load_json(self.company_tickers),
+            timestamp = self._tickers_mtime(),
+            backend = self.json_backend or 'stdlib',
+            trusted = self.trusted
+        )
+        if self.index_path is not None:
+            index.dump(self.index_path)
+        return index
+
+
+class FetchBulk(_FetchLocal):
     """Fetch from bulk filing data.
 
     Args:
         company_tickers (Path): path to company_tickers.json
         companyfacts_dir (Path): path to companyfacts directory
+        index_path (Path): optional path to persist the CIK index
+        lazy (bool): decode concepts on first access
+        json_backend (str): JSON backend, e.g. 'orjson' or 'auto'
+        trusted (bool): skip validating decoded data
     """
 
     def __init__(
         self,
         company_tickers: Path,
-        companyfacts_dir: Path
+        companyfacts_dir: Path,
+        index_path: Path | None = None,
+        lazy: bool = False,
+        json_backend: str | None = None,
+        trusted: bool = False
     ):
         """Initialize paths."""
         self.company_tickers = company_tickers
         self.companyfacts_dir = companyfacts_dir
+        self.index_path = index_path
+        self.lazy = lazy
+        self.json_backend = json_backend
+        self.trusted = trusted
 
-    def _load_json(self, path: Path) -> str:
-        """Load JSON file with error handling."""
+    def companyfacts(self, ticker: str) -> CompanyFacts:
+        """Fetch companyfacts for given ticker symbol."""
+        cik_data: CompanyCIK = self.cik(ticker)
+        cik = str(cik_data.cik).zfill(10)
+        companyfacts_file = self.companyfacts_dir / f'CIK{cik}.json'
+        companyfacts_json: str = self._load_json(companyfacts_file)
+        return self._decode(companyfacts_json)
+
+    def companyfacts_many(
+        self,
+        tickers: Iterable[str],
+        workers: int | None = None,
+        chunksize: int = 8
+    ) -> Iterator[FetchResult]:
+        """Fetch companyfacts for many tickers across worker processes.
+
+        Ticker lookups happen here, file reads and decoding happen in a
+        process pool. Results are yielded in the order of `tickers`, and
+        failures are reported per ticker in `FetchResult.error`.
+
+        Args:
+            tickers (Iterable[str]): ticker symbols
+            workers (int): worker processes, defaults to CPU count
+            chunksize (int): files handed to a worker at a time
+        """
+        tickers = list(tickers)
+        paths: list[Path | None] = []
+        lookup_errors: dict[int, SECfilrError] = {}
+        for i, ticker in enumerate(tickers):
+            try:
+                cik = str(self.cik(ticker).cik).zfill(10)
+            except Exception as e:
+                lookup_errors[i] = _ticker_error(ticker, e)
+                paths.append(None)
+                continue
+            paths.append(self.companyfacts_dir / f'CIK{cik}.json')
+
+        to_load = [p for p in paths if p is not None]
+        load = partial(
+            _load_companyfacts_file,
+            lazy = self.lazy,
+            backend = self.json_backend,
+            trusted = self.trusted
+        )
+        if workers == 1:
+            loaded = map(load, to_load)
+            yield from _merge_results(tickers, lookup_errors, loaded)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            loaded = executor.map(load, to_load, chunksize=chunksize)
+            yield from _merge_results(tickers, lookup_errors, loaded)
+
+
+def _load_companyfacts_file(
+    path: Path,
+    lazy: bool = False,
+    backend: str | None = None,
+    trusted: bool = False
+) -> tuple[CompanyFacts | None, SECfilrError | None]:
+    """Read and decode a companyfacts file, returning any error."""
+    try:
+        companyfacts_json = FetchBulk._load_json(path)
+        companyfacts = decode_companyfacts_json(
+            companyfacts_json,
+            lazy = lazy,
+            backend = backend,
+            trusted = trusted
+        )
+        return companyfacts, None
+    except SECfilrError as e:
+        return None, e
+
+
+def _merge_results(
+    tickers: list[str],
+    lookup_errors: dict[int, SECfilrError],
+    loaded: Iterator[tuple[CompanyFacts | None, SECfilrError | None]]
+) -> Iterator[FetchResult]:
+    """Merge lookup failures and loaded files back into ticker order."""
+    for i, ticker in enumerate(tickers):
+        if i in lookup_errors:
+            yield FetchResult(ticker=ticker, error=lookup_errors[i])
+            continue
+        companyfacts, error = next(loaded)
+        yield FetchResult(
+            ticker = ticker,
+            companyfacts = companyfacts,
+            error = error
+        )
+
+
+class FetchZip(_FetchLocal):
+    """Fetch straight from the bulk companyfacts.zip archive.
+
+    The archive's central directory is indexed by CIK once, then each
+    lookup seeks to and decompresses only the requested member.
+
+    Args:
+        company_tickers (Path): path to company_tickers.json
+        companyfacts_zip (Path): path to companyfacts.zip
+        index_path (Path): optional path to persist the CIK index
+        lazy (bool): decode concepts on first access
+        json_backend (str): JSON backend, e.g. 'orjson' or 'auto'
+        trusted (bool): skip validating decoded data
+    """
+
+    def __init__(
+        self,
+        company_tickers: Path,
+        companyfacts_zip: Path,
+        index_path: Path | None = None,
+        lazy: bool = False,
+        json_backend: str | None = None,
+        trusted: bool = False
+    ):
+        """Initialize paths."""
+        self.company_tickers = company_tickers
+        self.companyfacts_zip = companyfacts_zip
+        self.index_path = index_path
+        self.lazy = lazy
+        self.json_backend = json_backend
+        self.trusted = trusted
+        self._zip: zipfile.ZipFile | None = None
+        self._zip_mtime: float | None = None
+        self._members: dict[int, zipfile.ZipInfo] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'FetchZip':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the archive."""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+            self._zip, self._zip_mtime, self._members = None, None, {}
+
+    def _archive(self) -> zipfile.ZipFile:
+        """Open the archive and index members, re-opening if replaced."""
         try:
-            with open(path, 'r') as f:
-                return f.read()
+            mtime = self.companyfacts_zip.stat().st_mtime
+            with self._lock:
+                if self._zip is not None and self._zip_mtime == mtime:
+                    return self._zip
+                if self._zip is not None:
+                    self._zip.close()
+                self._zip = zipfile.ZipFile(self.companyfacts_zip, 'r')
+                self._zip_mtime = mtime
+                self._members = index_zip_members(self._zip)
+                return self._zip
+        except Exception as e:
+            raise FetchError(
+                f'Error reading: {self.companyfacts_zip.resolve()}'
+            ) from e
+
+    def members(self) -> dict[int, zipfile.ZipInfo]:
+        """Get archive members keyed by CIK."""
+        self._archive()
+        return self._members
 
+    def _read_member(self, cik: int) -> str:
+        """Decompress a single companyfacts member."""
+        archive = self._archive()
+        info = self._members.get(cik)
+        if info is None:
+            raise FetchError(
+                f'CIK{str(cik).zfill(10)} not found in '
+                f'{self.companyfacts_zip.resolve()}'
+            )
+        try:
+            with instrument.span('disk', info.filename) as span:
+                data = archive.read(info)
+                span.nbytes = len(data)
+            return data.decode('utf-8')
         except Exception as e:
-            raise FetchError(f'Error reading: {path.resolve()}') from e
+            raise FetchError(f'Error reading member: {info.filename}') from e
 
     def companyfacts(self, ticker: str) -> CompanyFacts:
         """Fetch companyfacts for given ticker symbol."""
-        ticker_fmt = ticker.strip().lower()
-        cik_json = self._load_json(self.company_tickers)
-        cik_data: CompanyCIK = decode_cik_json(cik_json, ticker=ticker_fmt)
-        cik = str(cik_data.cik).zfill(10)
-        companyfacts_file = self.companyfacts_dir / f'CIK{cik}.json'
-        companyfacts_json: str = self._load_json(companyfacts_file)
-        return decode_companyfacts_json(companyfacts_json)
+        cik_data: CompanyCIK = self.cik(ticker)
+        companyfacts_json: str = self._read_member(cik_data.cik)
+        return self._decode(companyfacts_json)
+
+
+def _prefetched(items: Iterator, size: int) -> Iterator:
+    """Run an iterator ahead on a thread, holding at most `size` items.
+
+    Exceptions are re-raised in the consumer, and closing the consumer
+    stops the thread.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except BaseException as e:
+            put((done, e))
+            return
+        finally:
+            # Release files held by a generator stopped part way
+            close = getattr(items, 'close', None)
+            if close is not None:
+                close()
+        put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def iter_companyfacts_json(
+    source: Path,
+    ciks: Iterable[int] | None = None,
+    prefetch: int = 0,
+    skip_errors: bool = False
+) -> Iterator[tuple[int, str]]:
+    """Iterate raw companyfacts JSON from bulk data.
+
+    Args:
+        source (Path): companyfacts directory, or companyfacts.zip
+        ciks (Iterable[int]): only these companies, defaults to all
+        prefetch (int): documents read ahead on a background thread
+        skip_errors (bool): skip documents that can't be read
+    Yields:
+        tuple[int, str]: CIK and companyfacts JSON text
+    """
+    if prefetch > 0:
+        yield from _prefetched(
+            iter_companyfacts_json(source, ciks, skip_errors=skip_errors),
+            prefetch
+        )
+        return
+    wanted = None if ciks is None else set(ciks)
+    if source.is_dir():
+        for path in sorted(source.glob('CIK*.json')):
+            cik = member_cik(path.name)
+            if cik is None or (wanted is not None and cik not in wanted):
+                continue
+            try:
+                json_str = FetchBulk._load_json(path)
+            except FetchError:
+                if skip_errors:
+                    continue
+                raise
+            yield cik, json_str
+        return
+
+    try:
+        archive = zipfile.ZipFile(source, 'r')
+    except Exception as e:
+        raise FetchError(f'Error reading: {source.resolve()}') from e
+    with archive:
+        for cik, info in index_zip_members(archive).items():
+            if wanted is not None and cik not in wanted:
+                continue
+            try:
+                json_str = archive.read(info).decode('utf-8')
+            except Exception as e:
+                if skip_errors:
+                    continue
+                raise FetchError(
+                    f'Error reading member: {info.filename}'
+                ) from e
+            yield cik, json_str
 
 
 class FetchRequest(Fetch):
@@ -64,22 +489,259 @@ class FetchRequest(Fetch):
 
     Args:
         user_agent (str): EDGAR API User-Agent
+        index_path (Path): optional path to persist the CIK index
+        index_max_age (float): seconds before the CIK index is refetched
+        client (HTTPClient): optional client, defaults to process-wide one
+        cik_url (str): company_tickers.json endpoint
+        facts_url (str): companyfacts endpoint prefix
+        lazy (bool): decode concepts on first access
+        cache (HTTPCache): optional on-disk response cache
+        json_backend (str): JSON backend, e.g. 'orjson' or 'auto'
+        trusted (bool): skip validating decoded data
     """
 
-    def __init__(self, user_agent: str):
-        """Initialize headers."""
+    def __init__(
+        self,
+        user_agent: str,
+        index_path: Path | None = None,
+        index_max_age: float = 86400.0,
+        client: HTTPClient | None = None,
+        cik_url: str = EDGAR_CIK_URL,
+        facts_url: str = EDGAR_FACTS_URL,
+        lazy: bool = False,
+        cache: HTTPCache | None = None,
+        json_backend: str | None = None,
+        trusted: bool = False
+    ):
+        """Initialize headers and endpoints."""
         self.headers = {'User-Agent': user_agent}
+        self.client = client
+        self.cache = cache
+        self.cik_url = cik_url
+        self.facts_url = facts_url
+        self.lazy = lazy
+        self.json_backend = json_backend
+        self.trusted = trusted
+        self.index_path = index_path
+        self.index_max_age = index_max_age
+
+    def _cik_index_stale(self, index: CIKIndex) -> bool:
+        """Index is stale once older than `index_max_age`."""
+        return time.time() - index.timestamp > self.index_max_age
+
+    def _request(self, url: str) -> str:
+        """Get a response body, through the cache if one is set."""
+        if self.cache is None:
+            return make_request(
+                url=url,
+                headers=self.headers,
+                client=self.client
+            )
+        try:
+            return self.cache.get(url, self.headers, self.client)
+        except Exception as e:
+            raise RequestError('Error encountered during request') from e
+
+    def _build_cik_index(self) -> CIKIndex:
+        """Build index from EDGAR company_tickers.json, or a fresh copy."""
+        index = _load_persisted_index(self.index_path)
+        if index is not None and not self._cik_index_stale(index):
+            return index
+        cik_json: str = self._request(self.cik_url)
+        index = CIKIndex.from_json(
+            cik_json,
+            backend = self.json_backend or 'stdlib',
+            trusted = self.trusted
+        )
+        if self.index_path is not None:
+            index.dump(self.index_path)
+        return index
 
     def companyfacts(self, ticker: str) -> CompanyFacts:
         """Fetch companyfacts for given ticker symbol."""
-        ticker_fmt = ticker.strip().lower()
-        cik_json: str = make_request(url=EDGAR_CIK_URL, headers=self.headers)
-        cik_data: CompanyCIK = decode_cik_json(cik_json, ticker=ticker_fmt)
+        cik_data: CompanyCIK = self.cik(ticker)
         cik = str(cik_data.cik).zfill(10)
-        cik_facts_url = f'{EDGAR_FACTS_URL}{cik}.json'
-        companyfacts_json: str = make_request(
-            url=cik_facts_url,
-            headers=self.headers
-        )
-        return decode_companyfacts_json(companyfacts_json)
+        cik_facts_url = f'{self.facts_url}{cik}.json'
+        companyfacts_json: str = self._request(cik_facts_url)
+        return self._decode(companyfacts_json)
+
+
+class AsyncFetchRequest(FetchRequest):
+    """Fetch concurrently using requests to SEC EDGAR.
+
+    Requests run on a pool of worker threads sharing the pooled client,
+    whose rate limiter keeps the batch within EDGAR's fair-access limit.
+
+    Args:
+        user_agent (str): EDGAR API User-Agent
+        concurrency (int): maximum requests in flight
+        **kwargs: passed through to `FetchRequest`
+    """
+
+    def __init__(self, user_agent: str, concurrency: int = 10, **kwargs):
+        """Initialize headers, endpoints and concurrency."""
+        super().__init__(user_agent, **kwargs)
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+
+    async def acompanyfacts(self, ticker: str) -> CompanyFacts:
+        """Fetch companyfacts for given ticker symbol without blocking."""
+        return await asyncio.to_thread(self.companyfacts, ticker)
+
+    async def companyfacts_many(
+        self,
+        tickers: Iterable[str]
+    ) -> AsyncIterator[FetchResult]:
+        """Fetch companyfacts for many tickers, yielding as they complete.
+
+        Failures are reported per ticker in `FetchResult.error`, and do
+        not abort the rest of the batch.
+        """
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        slots = asyncio.Semaphore(self.concurrency)
+
+        index_error: SECfilrError | None = None
+
+        async def fetch_one(ticker: str) -> FetchResult:
+            if index_error is not None:
+                return FetchResult(ticker=ticker, error=index_error)
+            async with slots:
+                try:
+                    companyfacts = await loop.run_in_executor(
+                        executor, self.companyfacts, ticker
+                    )
+                except Exception as e:
+                    return FetchResult(
+                        ticker = ticker, error = _ticker_error(ticker, e)
+                    )
+            return FetchResult(ticker=ticker, companyfacts=companyfacts)
+
+        tasks: list[asyncio.Future] = []
+        try:
+            # Build the index once up front, rather than racing to build
+            # it, and report a failure against every ticker
+            try:
+                await loop.run_in_executor(executor, self.cik_index)
+            except SECfilrError as e:
+                index_error = e
+            tasks = [asyncio.ensure_future(fetch_one(t)) for t in tickers]
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class CacheStats:
+    """Snapshot of `FetchCache` counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FetchCache(Fetch):
+    """Keep decoded companyfacts from another fetcher in memory.
+
+    Entries are keyed by CIK, so share classes of one company share an
+    entry, or by ticker when the wrapped fetcher has no CIK index, and
+    are evicted least recently used first once their combined
+    approximate size exceeds `max_bytes`. Lazily decoded companyfacts
+    grow as concepts are decoded, so an entry is re-measured each time
+    it is served, and every entry is re-measured before evicting for a
+    new one.
+
+    Args:
+        fetcher (Fetch): fetcher to wrap
+        max_bytes (int): approximate memory budget for cached entries
+    """
+
+    def __init__(self, fetcher: Fetch, max_bytes: int = 512 << 20):
+        """Initialize an empty cache around `fetcher`."""
+        self.fetcher = fetcher
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[
+            int | str, tuple[CompanyFacts, int]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def __repr__(self) -> str:
+        return f'FetchCache(fetcher={self.fetcher!r})'
+
+    def cik_index(self) -> CIKIndex:
+        """Get the wrapped fetcher's ticker/CIK index."""
+        return self.fetcher.cik_index()
+
+    def companyfacts(self, ticker: str) -> CompanyFacts:
+        """Fetch companyfacts for given ticker symbol, cached by CIK."""
+        try:
+            key: int | str = self.cik(ticker).cik
+        except IndexUnavailable:
+            key = ticker.strip().lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                self._resize(key)
+                self._evict()
+                return entry[0]
+            self._stats.misses += 1
+
+        companyfacts = self.fetcher.companyfacts(ticker)
+        nbytes = companyfacts_nbytes(companyfacts)
+        if nbytes > self.max_bytes:
+            return companyfacts
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stats.nbytes -= previous[1]
+            for cached in list(self._entries):
+                self._resize(cached)
+            self._entries[key] = (companyfacts, nbytes)
+            self._stats.nbytes += nbytes
+            self._evict()
+        return companyfacts
+
+    def _resize(self, key: int | str) -> None:
+        """Re-measure an entry, with the lock held."""
+        companyfacts, nbytes = self._entries[key]
+        current = companyfacts_nbytes(companyfacts)
+        self._entries[key] = (companyfacts, current)
+        self._stats.nbytes += current - nbytes
+
+    def _evict(self) -> None:
+        """Evict least recently used entries, with the lock held."""
+        while self._stats.nbytes > self.max_bytes and self._entries:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._stats.nbytes -= evicted
+            self._stats.evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits = self._stats.hits,
+                misses = self._stats.misses,
+                evictions = self._stats.evictions,
+                entries = len(self._entries),
+                nbytes = self._stats.nbytes
+            )
 
+    def clear(self) -> None:
+        """Drop all cached entries, keeping counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.nbytes = 0
@@ -0,0 +1,192 @@
+"""Instrumentation hooks for the fetch, decode and parse pipeline.
+
+Register a hook to receive an `Event` for each timed stage:
+
+- 'network': an HTTP request, including rate limiting and retries
+- 'disk': reading a companyfacts or company_tickers.json file
+- 'decode': decoding companyfacts or company_tickers.json text
+- 'parse': parsing a metric from decoded concepts
+
+`Stats` is a ready-made hook aggregating counts, errors, time and bytes
+per stage. With no hooks registered, instrumented code skips timing
+entirely. Hooks are per process, work done in worker processes (e.g.
+`FetchBulk.companyfacts_many`) is not reported.
+"""
+
+import threading
+import time
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """One timed pipeline stage.
+
+    Args:
+        stage (str): 'network', 'disk', 'decode' or 'parse'
+        name (str): what was processed, e.g. a URL, path or concept
+        elapsed (float): wall time in seconds
+        nbytes (int): bytes processed, if known
+        error (BaseException): exception raised by the stage, if any
+    """
+    stage: str
+    name: str
+    elapsed: float
+    nbytes: int | None = None
+    error: BaseException | None = None
+
+
+Hook = Callable[[Event], None]
+
+_hooks: tuple[Hook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: Hook) -> None:
+    """Register a hook called with every `Event`."""
+    global _hooks
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unregister a hook, ignoring hooks that aren't registered."""
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def enabled() -> bool:
+    """Check whether any hooks are registered."""
+    return bool(_hooks)
+
+
+def emit(event: Event) -> None:
+    """Send an event to every registered hook.
+
+    A failing hook is reported as a warning rather than interrupting
+    the instrumented work.
+    """
+    for hook in _hooks:
+        try:
+            hook(event)
+        except Exception as e:
+            warnings.warn(
+                f'Instrumentation hook {hook!r} failed: {e!r}',
+                RuntimeWarning,
+                stacklevel = 2
+            )
+
+
+class Span:
+    """Context manager timing one stage and emitting its `Event`.
+
+    Set `nbytes` inside the block to report the bytes processed.
+    """
+
+    __slots__ = ('stage', 'name', 'nbytes', '_start')
+
+    def __init__(self, stage: str, name: str) -> None:
+        self.stage = stage
+        self.name = name
+        self.nbytes: int | None = None
+        self._start = 0.0
+
+    def __enter__(self) -> 'Span':
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        emit(Event(
+            stage = self.stage,
+            name = self.name,
+            elapsed = time.perf_counter() - self._start,
+            nbytes = self.nbytes,
+            error = exc
+        ))
+
+
+class _NullSpan:
+    """Stand-in for `Span` while no hooks are registered."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+    def __setattr__(self, name: str, value: object) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(stage: str, name: str = '') -> Span | _NullSpan:
+    """Time a stage, or do nothing if no hooks are registered."""
+    if _hooks:
+        return Span(stage, name)
+    return _NULL_SPAN
+
+
+@dataclass
+class StageStats:
+    """Aggregated events for one stage."""
+    count: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    nbytes: int = 0
+    max_elapsed: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.elapsed / self.count if self.count else 0.0
+
+
+class Stats:
+    """Hook aggregating events per stage.
+
+    Usage:
+        stats = Stats()
+        add_hook(stats)
+        ...
+        stats.snapshot()['network'].elapsed
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty per-stage totals."""
+        self._lock = threading.Lock()
+        self._stages: dict[str, StageStats] = {}
+
+    def __repr__(self) -> str:
+        return f'Stats(stages={sorted(self._stages)})'
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            stage = self._stages.get(event.stage)
+            if stage is None:
+                stage = self._stages[event.stage] = StageStats()
+            stage.count += 1
+            stage.elapsed += event.elapsed
+            stage.max_elapsed = max(stage.max_elapsed, event.elapsed)
+            if event.nbytes is not None:
+                stage.nbytes += event.nbytes
+            if event.error is not None:
+                stage.errors += 1
+
+    def snapshot(self) -> dict[str, StageStats]:
+        """Get a copy of the totals for each stage seen so far."""
+        with self._lock:
+            return {
+                name: StageStats(**vars(stage))
+                for name, stage in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        """Clear all totals."""
+        with self._lock:
+            self._stages.clear()
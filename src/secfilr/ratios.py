@@ -0,0 +1,245 @@
+"""Financial ratios over statement metrics.
+
+Metrics are aligned on SEC calendar frames, and each ratio is computed a
+whole column at a time over float arrays, with NaN wherever an input is
+missing. Many companies are computed as one batch, each company holding
+an equal-length block of a contiguous period axis, so growth rates are a
+fixed offset within each block.
+
+Column operations run as numpy array operations when numpy is
+installed, and fall back to plain Python loops otherwise. Either way,
+results are `array('d')` columns.
+
+Ratios are per period and not annualised, e.g. quarterly ROE is net
+income for the quarter over equity at the end of the quarter.
+"""
+
+import math
+import operator
+import re
+from array import array
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from secfilr._models import RatioTable
+from secfilr.company import Company
+from secfilr.exceptions import InvalidMetric, ParsingError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_NAN = math.nan
+_PERIOD = re.compile(r'CY(\d{4})(?:Q([1-4]))?')
+
+
+def _from_numpy(values: 'np.ndarray') -> array:
+    out = array('d')
+    out.frombytes(values.tobytes())
+    return out
+
+
+def _div(a: array, b: array) -> array:
+    """Element-wise a / b, NaN where b is zero or missing."""
+    if np is not None:
+        x, y = np.frombuffer(a), np.frombuffer(b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _from_numpy(np.where(y != 0, x / y, np.nan))
+    return array(
+        'd', [x / y if y else _NAN for x, y in zip(a, b, strict=True)]
+    )
+
+
+def _sub(a: array, b: array) -> array:
+    """Element-wise a - b."""
+    if np is not None:
+        return _from_numpy(np.frombuffer(a) - np.frombuffer(b))
+    return array('d', map(operator.sub, a, b))
+
+
+def _growth(a: array, block: int, lag: int) -> array:
+    """Change over `lag` periods within each company's block."""
+    out = array('d', [_NAN]) * len(a)
+    # No block is long enough to hold a period and its lagged one
+    if block <= lag:
+        return out
+    if np is not None:
+        # One row per company, so the lag never crosses companies
+        values = np.frombuffer(a).reshape(-1, block)
+        current, previous = values[:, lag:], values[:, :-lag]
+        change = np.full(values.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change[:, lag:] = np.where(
+                previous != 0, (current - previous) / np.abs(previous), np.nan
+            )
+        return _from_numpy(change)
+    for start in range(0, len(a), block):
+        current = a[start + lag:start + block]
+        previous = a[start:start + block - lag]
+        out[start + lag:start + block] = array('d', [
+            (c - p) / abs(p) if p else _NAN
+            for c, p in zip(current, previous, strict=True)
+        ])
+    return out
+
+
+@dataclass(frozen=True)
+class Ratio:
+    """A ratio computed from metric columns.
+
+    Args:
+        inputs (tuple[str, ...]): metric keys from `_xbrl_labels.map_arg`
+        compute (Callable): input columns, block length and growth lag in
+            periods -> ratio column
+    """
+    inputs: tuple[str, ...]
+    compute: Callable[[list[array], int, int], array]
+
+
+def quotient(numerator: str, denominator: str) -> Ratio:
+    """Ratio of two metrics."""
+    return Ratio(
+        (numerator, denominator), lambda cols, block, lag: _div(*cols)
+    )
+
+
+def difference(minuend: str, subtrahend: str) -> Ratio:
+    """Difference of two metrics."""
+    return Ratio(
+        (minuend, subtrahend), lambda cols, block, lag: _sub(*cols)
+    )
+
+
+def growth(metric: str) -> Ratio:
+    """Year over year growth of a metric."""
+    return Ratio(
+        (metric,), lambda cols, block, lag: _growth(cols[0], block, lag)
+    )
+
+
+RATIOS: dict[str, Ratio] = {
+    'gross_margin': quotient('gprofit', 'revenue'),
+    'operating_margin': quotient('opinc', 'revenue'),
+    'net_margin': quotient('netinc', 'revenue'),
+    'roe': quotient('netinc', 'equity'),
+    'roa': quotient('netinc', 'assets'),
+    'current_ratio': quotient('cassets', 'cliab'),
+    'debt_to_equity': quotient('debt', 'equity'),
+    'fcf': difference('ocf', 'capex'),
+    'revenue_growth': growth('revenue'),
+    'earnings_growth': growth('netinc'),
+}
+
+
+def _period_number(period: str) -> int:
+    """Consecutive number for a 'CY2024' or 'CY2024Q3' period."""
+    year, quarter = _PERIOD.fullmatch(period).groups()
+    return int(year) * 4 + int(quarter) - 1 if quarter else int(year)
+
+
+def _period_name(number: int, annual: bool) -> str:
+    if annual:
+        return f'CY{number}'
+    return f'CY{number // 4}Q{number % 4 + 1}'
+
+
+def _values_by_period(
+    company: Company,
+    metric: str,
+    annual: bool
+) -> dict[int, float]:
+    """Read a metric's values keyed by period number."""
+    try:
+        by_period = company.metric(metric).calendar(annual)
+    except ParsingError:
+        return {}
+    return {
+        _period_number(period): float(filing['val'])
+        for period, filing in by_period.items()
+    }
+
+
+def _select(names: Iterable[str] | None) -> dict[str, Ratio]:
+    if names is None:
+        return dict(RATIOS)
+    try:
+        return {name: RATIOS[name] for name in names}
+    except KeyError as e:
+        raise InvalidMetric(f'{e.args[0]} is not a defined ratio') from e
+
+
+def ratios_many(
+    companies: Iterable[Company],
+    names: Iterable[str] | None = None,
+    annual: bool = False,
+    last: int | None = None
+) -> list[RatioTable]:
+    """Compute ratio time series for many companies in one batch.
+
+    Args:
+        companies (Iterable[Company])
+        names (Iterable[str]): keys of `RATIOS`, defaults to all
+        annual (bool): use years instead of quarters; balance sheet
+            values are taken at the end of Q4
+        last (int): keep only the most recent periods
+    Returns:
+        list[RatioTable]: one per company, in the given order, covering
+            the periods where the company reported any input
+    """
+    companies = list(companies)
+    selected = _select(names)
+    metrics = list(dict.fromkeys(
+        metric for ratio in selected.values() for metric in ratio.inputs
+    ))
+    by_company = [
+        {m: _values_by_period(c, m, annual) for m in metrics}
+        for c in companies
+    ]
+
+    # Contiguous period axis shared by every company's block
+    numbers = {n for values in by_company for v in values.values() for n in v}
+    first = min(numbers, default=0)
+    block = max(numbers, default=-1) - first + 1
+    columns: dict[str, array] = {}
+    for metric in metrics:
+        column = array('d', [_NAN]) * (block * len(companies))
+        for i, values in enumerate(by_company):
+            base = i * block - first
+            for number, value in values[metric].items():
+                column[base + number] = value
+        columns[metric] = column
+
+    lag = 1 if annual else 4
+    results = {
+        name: ratio.compute([columns[m] for m in ratio.inputs], block, lag)
+        for name, ratio in selected.items()
+    }
+
+    tables = []
+    for i, values in enumerate(by_company):
+        reported = sorted({n for v in values.values() for n in v})
+        if last is not None:
+            reported = reported[-last:] if last > 0 else []
+        offsets = [i * block + n - first for n in reported]
+        tables.append(RatioTable(
+            periods = [_period_name(n, annual) for n in reported],
+            values = {
+                name: array('d', [column[j] for j in offsets])
+                for name, column in results.items()
+            }
+        ))
+    return tables
+
+
+def ratios(
+    company: Company,
+    names: Iterable[str] | None = None,
+    annual: bool = False,
+    last: int | None = None
+) -> RatioTable:
+    """Compute ratio time series for one company.
+
+    See `ratios_many`.
+    """
+    return ratios_many([company], names, annual, last)[0]
@@ -0,0 +1,429 @@
+"""Query-optimised local store of bulk filing data.
+
+`build_store` converts `Downloader` output into a SQLite database, with
+facts keyed by (CIK, concept, unit, period), and `update_store` refreshes
+only the companies that changed. `FetchStore` serves
+companyfacts from it with a few indexed reads per company, and answers
+cross-sectional queries over all companies through a frame index.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+from secfilr._index import CIKIndex
+from secfilr._models import (
+    CompanyCIK,
+    CompanyFacts,
+    Facts,
+    Metric,
+    concept_nbytes,
+)
+from secfilr._parse import metric_labels
+from secfilr.exceptions import FetchError, FileDecodeError
+from secfilr.fetch import Fetch, FetchBulk, iter_companyfacts_json
+
+_SCHEMA = '''
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE tickers (
+    ticker TEXT PRIMARY KEY,
+    cik INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    pos INTEGER NOT NULL
+);
+CREATE TABLE companies (
+    cik INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE concepts (
+    id INTEGER PRIMARY KEY,
+    cik INTEGER NOT NULL,
+    concept TEXT NOT NULL,
+    label TEXT,
+    description TEXT,
+    units TEXT NOT NULL
+);
+CREATE TABLE facts (
+    concept_id INTEGER NOT NULL,
+    unit TEXT NOT NULL,
+    start TEXT,
+    end TEXT,
+    val,
+    accn TEXT,
+    fy INTEGER,
+    fp TEXT,
+    form TEXT,
+    filed TEXT,
+    frame TEXT
+);
+'''
+
+_INDEXES = '''
+CREATE UNIQUE INDEX concepts_cik ON concepts (cik, concept);
+CREATE INDEX concepts_concept ON concepts (concept);
+CREATE INDEX facts_period ON facts (concept_id, unit, end);
+CREATE INDEX facts_frame ON facts (frame, concept_id);
+'''
+
+_FILING_KEYS = (
+    'start', 'end', 'val', 'accn', 'fy', 'fp', 'form', 'filed', 'frame'
+)
+
+
+def _insert_company(db: sqlite3.Connection, cik: int, raw: dict) -> None:
+    """Insert one decoded companyfacts document."""
+    db.execute(
+        'INSERT OR REPLACE INTO companies VALUES (?, ?)',
+        (cik, raw.get('entityName') or '')
+    )
+    concepts: dict = raw.get('facts', {}).get('us-gaap', {})
+    for concept, body in concepts.items():
+        units: dict = body.get('units') or {}
+        cursor = db.execute(
+            'INSERT INTO concepts (cik, concept, label, description, units) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (
+                cik,
+                concept,
+                body.get('label'),
+                body.get('description'),
+                json.dumps(list(units)),
+            )
+        )
+        concept_id = cursor.lastrowid
+        db.executemany(
+            'INSERT INTO facts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                (concept_id, unit, *(f.get(k) for k in _FILING_KEYS))
+                for unit, filings in units.items()
+                for f in filings
+            )
+        )
+
+
+def _delete_company(db: sqlite3.Connection, cik: int) -> None:
+    """Delete one company's facts, concepts and name."""
+    db.execute(
+        'DELETE FROM facts WHERE concept_id IN '
+        '(SELECT id FROM concepts WHERE cik = ?)',
+        (cik,)
+    )
+    db.execute('DELETE FROM concepts WHERE cik = ?', (cik,))
+    db.execute('DELETE FROM companies WHERE cik = ?', (cik,))
+
+
+def _insert_tickers(db: sqlite3.Connection, company_tickers: Path) -> None:
+    """Replace the tickers table from company_tickers.json."""
+    json_str = FetchBulk._load_json(company_tickers)
+    try:
+        timestamp = company_tickers.stat().st_mtime
+    except OSError as e:
+        raise FetchError(f'Error reading: {company_tickers.resolve()}') from e
+    index = CIKIndex.from_json(json_str, timestamp=timestamp)
+    db.execute('DELETE FROM tickers')
+    db.executemany(
+        'INSERT OR IGNORE INTO tickers VALUES (?, ?, ?, ?)',
+        ((e.ticker, e.cik, e.title, pos) for pos, e in enumerate(index))
+    )
+    db.execute(
+        'INSERT OR REPLACE INTO meta VALUES (?, ?)',
+        ('tickers_timestamp', str(index.timestamp))
+    )
+
+
+def _insert_companies(
+    db: sqlite3.Connection,
+    companyfacts: Path,
+    ciks: set[int] | None = None
+) -> None:
+    """Insert companyfacts documents from bulk data."""
+    for cik, json_str in iter_companyfacts_json(companyfacts, ciks):
+        try:
+            raw = json.loads(json_str)
+        except json.JSONDecodeError as e:
+            raise FileDecodeError(
+                f'Error decoding companyfacts JSON for CIK {cik}'
+            ) from e
+        _insert_company(db, cik, raw)
+
+
+def build_store(
+    db_path: Path,
+    company_tickers: Path,
+    companyfacts: Path
+) -> None:
+    """Build a local store from bulk filing data.
+
+    Written to a temporary file and moved into place once complete, so
+    readers never see a partial store. The temporary file is removed if
+    the build fails.
+
+    Args:
+        db_path (Path): destination SQLite database
+        company_tickers (Path): path to company_tickers.json
+        companyfacts (Path): companyfacts directory, or companyfacts.zip
+    """
+    tmp_path = db_path.with_name(db_path.name + '.tmp')
+    tmp_path.unlink(missing_ok=True)
+
+    try:
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.execute('PRAGMA journal_mode = OFF')
+            db.execute('PRAGMA synchronous = OFF')
+            db.executescript(_SCHEMA)
+            _insert_tickers(db, company_tickers)
+            _insert_companies(db, companyfacts)
+            db.executescript(_INDEXES)
+            db.commit()
+        finally:
+            db.close()
+        tmp_path.replace(db_path)
+    except (sqlite3.Error, OSError) as e:
+        raise FetchError(f'Error building store: {db_path.resolve()}') from e
+    finally:
+        # Gone already once moved into place
+        tmp_path.unlink(missing_ok=True)
+
+
+def update_store(
+    db_path: Path,
+    company_tickers: Path,
+    companyfacts: Path,
+    ciks: Iterable[int]
+) -> None:
+    """Update a store in place for the given companies only.
+
+    Each company is deleted and re-inserted from `companyfacts`, or just
+    deleted if no longer there, and the tickers table is refreshed. All
+    in one transaction, so readers see either the old or the new data.
+
+    Args:
+        db_path (Path): SQLite database built with `build_store`
+        company_tickers (Path): path to company_tickers.json
+        companyfacts (Path): companyfacts directory, or companyfacts.zip
+        ciks (Iterable[int]): companies that changed
+    """
+    if not db_path.exists():
+        raise FetchError(f'Store not found: {db_path.resolve()}')
+    ciks = set(ciks)
+    db = sqlite3.connect(db_path)
+    try:
+        with db:
+            _insert_tickers(db, company_tickers)
+            for cik in ciks:
+                _delete_company(db, cik)
+            _insert_companies(db, companyfacts, ciks)
+    except sqlite3.Error as e:
+        raise FetchError(f'Error updating store: {db_path.resolve()}') from e
+    finally:
+        db.close()
+
+
+class _StoreConcepts(Mapping):
+    """Read-only mapping of a company's concepts, loaded on access."""
+
+    def __init__(self, store: 'FetchStore', concept_ids: dict[str, int]):
+        self._store = store
+        self._concept_ids = concept_ids
+        self._loaded: dict[str, dict] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f'StoreConcepts(concepts={len(self._concept_ids)}, '
+            f'loaded={len(self._loaded)})'
+        )
+
+    def __getitem__(self, concept: str) -> dict:
+        try:
+            return self._loaded[concept]
+        except KeyError:
+            pass
+        value = self._store._load_concept(self._concept_ids[concept])
+        self._loaded[concept] = value
+        return value
+
+    def __contains__(self, concept: object) -> bool:
+        return concept in self._concept_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._concept_ids)
+
+    def __len__(self) -> int:
+        return len(self._concept_ids)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by loaded concepts."""
+        return sys.getsizeof(self._concept_ids) + sum(
+            concept_nbytes(v) for v in list(self._loaded.values())
+        )
+
+
+class FetchStore(Fetch):
+    """Fetch from a local store built with `build_store`.
+
+    Args:
+        db_path (Path): path to the SQLite store
+        lazy (bool): load concepts on first access
+    """
+
+    def __init__(self, db_path: Path, lazy: bool = True):
+        """Open a read-only connection to the store."""
+        self.db_path = db_path
+        self.lazy = lazy
+        self._lock = threading.Lock()
+        try:
+            self._db = sqlite3.connect(
+                f'{db_path.resolve().as_uri()}?mode=ro',
+                uri = True,
+                check_same_thread = False
+            )
+        except sqlite3.Error as e:
+            raise FetchError(f'Error opening: {db_path.resolve()}') from e
+
+    def __enter__(self) -> 'FetchStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the store connection."""
+        self._db.close()
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        """Run a query with error handling."""
+        try:
+            with self._lock:
+                return self._db.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            raise FetchError(f'Error querying: {self.db_path}') from e
+
+    def _build_cik_index(self) -> CIKIndex:
+        """Build index from the store's tickers table."""
+        rows = self._query(
+            'SELECT cik, ticker, title FROM tickers ORDER BY pos'
+        )
+        timestamp = self._query(
+            "SELECT value FROM meta WHERE key = 'tickers_timestamp'"
+        )
+        return CIKIndex(
+            (
+                CompanyCIK.model_construct(cik=cik, ticker=ticker, title=title)
+                for cik, ticker, title in rows
+            ),
+            timestamp = float(timestamp[0][0]) if timestamp else None
+        )
+
+    def _load_concept(self, concept_id: int) -> dict:
+        """Rebuild a raw concept dict from its stored facts."""
+        (label, description, units), = self._query(
+            'SELECT label, description, units FROM concepts WHERE id = ?',
+            (concept_id,)
+        )
+        units_dict: dict[str, list[dict]] = {u: [] for u in json.loads(units)}
+        rows = self._query(
+            'SELECT unit, start, end, val, accn, fy, fp, form, filed, frame '
+            'FROM facts WHERE concept_id = ? ORDER BY rowid',
+            (concept_id,)
+        )
+        for unit, *values in rows:
+            units_dict[unit].append({
+                k: v
+                for k, v in zip(_FILING_KEYS, values, strict=True)
+                if v is not None
+            })
+        return {
+            'label': label,
+            'description': description,
+            'units': units_dict,
+        }
+
+    def companyfacts(self, ticker: str) -> CompanyFacts:
+        """Fetch companyfacts for given ticker symbol."""
+        cik = self.cik(ticker).cik
+        name = self._query('SELECT name FROM companies WHERE cik = ?', (cik,))
+        if not name:
+            raise FetchError(f'CIK {cik} not found in {self.db_path}')
+        concept_ids = dict(self._query(
+            'SELECT concept, id FROM concepts WHERE cik = ? ORDER BY id',
+            (cik,)
+        ))
+        concepts = _StoreConcepts(self, concept_ids)
+        return CompanyFacts.model_construct(
+            cik = cik,
+            name = name[0][0],
+            facts = Facts.model_construct(
+                concepts = concepts if self.lazy else dict(concepts)
+            )
+        )
+
+    def frame(self, metric: str, period: str) -> dict[int, Metric]:
+        """Get one metric for every company in a single period.
+
+        Each company's concept is chosen with the same label fallback
+        order and unit choice as `Company.metric`, then its value for the
+        period is read through the frame index.
+
+        Args:
+            metric (str): metric key, e.g. 'revenue'
+            period (str): SEC frame, e.g. 'CY2024Q4' or 'CY2024Q4I'
+        Returns:
+            dict[int, Metric]: CIK -> metric holding the period's filing
+        """
+        labels = metric_labels(metric.lower())
+        placeholders = ', '.join('?' * len(labels))
+        rank = {label: i for i, label in enumerate(labels)}
+
+        # Highest-ranked label present per company, with its first unit
+        chosen: dict[int, tuple] = {}
+        for cik, concept, concept_id, label, description, units in self._query(
+            'SELECT cik, concept, id, label, description, units '
+            f'FROM concepts WHERE concept IN ({placeholders})',
+            labels
+        ):
+            best = chosen.get(cik)
+            if best is None or rank[concept] < rank[best[0]]:
+                chosen[cik] = (
+                    concept, concept_id, label, description, units
+                )
+        wanted: dict[tuple[int, str], tuple[int, str, str]] = {}
+        for cik, (_, concept_id, label, description, units) in chosen.items():
+            units = json.loads(units)
+            if units:
+                wanted[concept_id, units[0]] = (cik, label, description)
+
+        # Instant facts carry an 'I' suffix, accept either form of period
+        base = period.removesuffix('I')
+        frames = (base, base + 'I')
+        results: dict[int, Metric] = {}
+        for concept_id, unit, frame, *values in self._query(
+            'SELECT f.concept_id, f.unit, f.frame, f.start, f.end, f.val, '
+            'f.accn, f.fy, f.fp, f.form, f.filed, f.frame '
+            'FROM facts f JOIN concepts c ON c.id = f.concept_id '
+            f'WHERE f.frame IN (?, ?) AND c.concept IN ({placeholders})',
+            (*frames, *labels)
+        ):
+            match = wanted.get((concept_id, unit))
+            if match is None:
+                continue
+            cik, label, description = match
+            if cik in results and frame != period:
+                continue
+            results[cik] = Metric(
+                label = label or '',
+                description = description or '',
+                unit = unit,
+                filings = [{
+                    k: v
+                    for k, v in zip(_FILING_KEYS, values, strict=True)
+                    if v is not None
+                }]
+            )
+        return results
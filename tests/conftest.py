@@ -0,0 +1,225 @@
+"""Shared fixtures for secfilr tests."""
+
+import json
+import threading
+import zipfile
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+TICKERS = {
+    '0': {'cik_str': 320193, 'ticker': 'AAPL', 'title': 'Apple Inc.'},
+    '1': {'cik_str': 789019, 'ticker': 'MSFT', 'title': 'MICROSOFT CORP'},
+    '2': {'cik_str': 1652044, 'ticker': 'GOOGL', 'title': 'Alphabet Inc.'},
+    '3': {'cik_str': 1652044, 'ticker': 'GOOG', 'title': 'Alphabet Inc.'},
+}
+
+QUARTERS = [(2023, q) for q in range(1, 5)] + [(2024, q) for q in range(1, 5)]
+
+
+def _quarter_end(year: int, quarter: int) -> date:
+    """Get last day of a calendar quarter."""
+    if quarter == 4:
+        return date(year, 12, 31)
+    return date(year, quarter * 3 + 1, 1) - timedelta(days=1)
+
+
+def _filings(base: float, instant: bool) -> list[dict]:
+    """Build quarterly filings, plus an un-framed restated duplicate."""
+    filings = []
+    for i, (year, quarter) in enumerate(QUARTERS):
+        end = _quarter_end(year, quarter)
+        filed = end + timedelta(days=30)
+        fp = 'FY' if quarter == 4 else f'Q{quarter}'
+        form = '10-K' if quarter == 4 else '10-Q'
+        filing = {
+            'end': end.isoformat(),
+            'val': base + i * 10,
+            'accn': f'0000320193-{year % 100:02d}-{i:06d}',
+            'fy': year,
+            'fp': fp,
+            'form': form,
+            'filed': filed.isoformat(),
+            'frame': f'CY{year}Q{quarter}' + ('I' if instant else ''),
+        }
+        if not instant:
+            start = _quarter_end(*QUARTERS[i - 1]) if i else date(2022, 12, 31)
+            filing['start'] = (start + timedelta(days=1)).isoformat()
+        filings.append(filing)
+    # Restated in a later filing, so SEC leaves the frame off
+    duplicate = dict(filings[0])
+    duplicate.pop('frame')
+    duplicate['filed'] = filings[4]['filed']
+    filings.insert(5, duplicate)
+    return filings
+
+
+def _concept(label: str, unit: str, filings: list[dict]) -> dict:
+    return {
+        'label': label,
+        'description': f'Description of {label}.',
+        'units': {unit: filings},
+    }
+
+
+def make_companyfacts(cik: int, name: str, scale: float = 1.0) -> dict:
+    """Build a small but realistically shaped companyfacts document."""
+    return {
+        'cik': cik,
+        'entityName': name,
+        'facts': {
+            'dei': {
+                'EntityCommonStockSharesOutstanding': _concept(
+                    'Entity Common Stock, Shares Outstanding',
+                    'shares',
+                    _filings(1000 * scale, instant=True),
+                ),
+            },
+            'us-gaap': {
+                'Assets': _concept(
+                    'Assets', 'USD', _filings(5000 * scale, instant=True)
+                ),
+                'StockholdersEquity': _concept(
+                    "Stockholders' Equity",
+                    'USD',
+                    _filings(2000 * scale, instant=True),
+                ),
+                'Revenues': _concept(
+                    'Revenues', 'USD', _filings(900 * scale, instant=False)
+                ),
+                'NetIncomeLoss': _concept(
+                    'Net Income (Loss)',
+                    'USD',
+                    _filings(100 * scale, instant=False),
+                ),
+                'EarningsPerShareBasic': _concept(
+                    'Earnings Per Share, Basic',
+                    'USD/shares',
+                    _filings(1.5 * scale, instant=False),
+                ),
+            },
+            'srt': {
+                'Revenues': _concept(
+                    'Not us-gaap', 'USD', _filings(1, instant=False)
+                ),
+            },
+        },
+    }
+
+
+COMPANIES = {
+    320193: make_companyfacts(320193, 'Apple Inc.', scale=3.0),
+    789019: make_companyfacts(789019, 'MICROSOFT CORP', scale=2.0),
+    1652044: make_companyfacts(1652044, 'Alphabet Inc.', scale=1.0),
+}
+
+
+def companyfacts_name(cik: int) -> str:
+    return f'CIK{str(cik).zfill(10)}.json'
+
+
+@pytest.fixture
+def bulkdata(tmp_path: Path) -> Path:
+    """Write a Downloader-shaped bulkdata directory."""
+    root = tmp_path / 'bulkdata'
+    facts_dir = root / 'companyfacts'
+    facts_dir.mkdir(parents=True)
+    (root / 'company_tickers.json').write_text(json.dumps(TICKERS))
+    with zipfile.ZipFile(
+        root / 'companyfacts.zip', 'w', zipfile.ZIP_DEFLATED
+    ) as zf:
+        for cik, facts in COMPANIES.items():
+            text = json.dumps(facts)
+            (facts_dir / companyfacts_name(cik)).write_text(text)
+            zf.writestr(companyfacts_name(cik), text)
+    return root
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Serve routes registered on the stand-in server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, send_body: bool) -> None:
+        path = self.path.split('?', 1)[0]
+        self.server.requests.append((self.command, path, dict(self.headers)))
+        self.server.peers.add(self.client_address)
+        route = self.server.routes.get(path)
+        if route is None:
+            status, headers, body = 404, {}, b'not found'
+        elif callable(route):
+            status, headers, body = route(self)
+        else:
+            status, headers, body = 200, {}, route
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local stand-in for SEC EDGAR endpoints.
+
+    `routes` maps a URL path to response bytes, or to a callable taking
+    the request handler and returning `(status, headers, body)`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), _StandInHandler)
+        self.routes: dict = {}
+        self.requests: list[tuple[str, str, dict]] = []
+        self.peers: set[tuple[str, int]] = set()
+
+    def url(self, path: str) -> str:
+        return f'http://127.0.0.1:{self.server_port}{path}'
+
+
+def static_file(body: bytes, etag: str = '"v1"'):
+    """Route serving a file with ETag validation and Range support."""
+
+    def route(handler):
+        headers = {'ETag': etag, 'Accept-Ranges': 'bytes'}
+        if handler.headers.get('If-None-Match') == etag:
+            return 304, headers, b''
+        range_header = handler.headers.get('Range')
+        if_range = handler.headers.get('If-Range')
+        if range_header and (if_range is None or if_range == etag):
+            first, _, last = range_header.removeprefix('bytes=').partition('-')
+            first = int(first)
+            last = int(last) if last else len(body) - 1
+            if first >= len(body):
+                return 416, {'Content-Range': f'bytes */{len(body)}'}, b''
+            headers['Content-Range'] = f'bytes {first}-{last}/{len(body)}'
+            return 206, headers, body[first:last + 1]
+        return 200, headers, body
+
+    return route
+
+
+@pytest.fixture
+def server():
+    """Run a stand-in HTTP server for the duration of a test."""
+    srv = StandInServer()
+    thread = threading.Thread(
+        target=srv.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+    )
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
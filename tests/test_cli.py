@@ -0,0 +1,73 @@
+"""Tests for the `secfilr` command."""
+
+import csv
+import json
+
+import pytest
+
+from secfilr.cli import FIELDS, main
+
+
+def test_export_csv(bulkdata, tmp_path):
+    out = tmp_path / 'out.csv'
+    status = main([
+        'AAPL', 'MSFT',
+        '--bulkdata', str(bulkdata),
+        '--statement', 'income',
+        '--metric', 'assets',
+        '--last', '2',
+        '--workers', '2',
+        '-o', str(out),
+    ])
+    assert status == 0
+    with open(out, newline='') as f:
+        reader = csv.DictReader(f)
+        assert tuple(reader.fieldnames) == FIELDS
+        rows = list(reader)
+    assert {r['ticker'] for r in rows} == {'AAPL', 'MSFT'}
+    assert {r['period'] for r in rows} == {'CY2024Q3', 'CY2024Q4'}
+    revenue = [
+        r for r in rows
+        if r['ticker'] == 'AAPL' and r['item'] == 'Income Statement: Revenue'
+    ]
+    assert [float(r['value']) for r in revenue] == [2760, 2770]
+    assets = [r for r in rows if r['item'] == 'assets']
+    assert len(assets) == 4
+
+
+def test_export_all_jsonl_from_zip(bulkdata, tmp_path):
+    out = tmp_path / 'out.jsonl'
+    status = main([
+        'all',
+        '--source', 'zip',
+        '--bulkdata', str(bulkdata),
+        '--metric', 'revenue',
+        '--last', '1',
+        '-o', str(out),
+    ])
+    assert status == 0
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    # GOOG and GOOGL share a CIK, so it's exported once
+    assert sorted(r['ticker'] for r in rows) == ['AAPL', 'GOOGL', 'MSFT']
+    assert {r['cik'] for r in rows} == {320193, 789019, 1652044}
+
+
+def test_failures_are_reported(bulkdata, capsys):
+    status = main([
+        'AAPL', 'NOPE',
+        '--bulkdata', str(bulkdata),
+        '--metric', 'netinc',
+        '--last', '1',
+        '--format', 'jsonl',
+    ])
+    captured = capsys.readouterr()
+    assert status == 1
+    assert 'NOPE' in captured.err
+    [row] = [json.loads(line) for line in captured.out.splitlines()]
+    assert row['ticker'] == 'AAPL'
+    assert row['value'] == 370
+
+
+def test_unknown_metric(bulkdata):
+    with pytest.raises(SystemExit):
+        main(['AAPL', '--bulkdata', str(bulkdata), '--metric', 'nope'])
@@ -0,0 +1,125 @@
+"""Tests for the `Company` interface."""
+
+import json
+import zipfile
+
+import pytest
+from conftest import COMPANIES, companyfacts_name, make_companyfacts
+
+from secfilr.company import Company, StatementType, iter_companies
+from secfilr.exceptions import (
+    FetchError,
+    FileDecodeError,
+    InvalidMetric,
+    ParsingError,
+)
+from secfilr.fetch import FetchBulk
+
+
+@pytest.fixture
+def fetcher(bulkdata):
+    return FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+
+
+def test_metrics_are_memoised(fetcher):
+    company = Company('AAPL', fetcher)
+    revenue = company.metric('revenue')
+    assert company.metric('REVENUE') is revenue
+    assert company.metric('revenue', compact=True) is not revenue
+    with pytest.raises(ParsingError):
+        company.metric('goodw')
+    with pytest.raises(ParsingError):
+        company.metric('goodw')
+    with pytest.raises(InvalidMetric):
+        company.metric('nope')
+
+
+def test_precompute_statement_metrics(fetcher):
+    company = Company('AAPL', fetcher, precompute=True)
+    assets = company.metric('assets')
+    statement = company.statement(StatementType.BALANCE_SHEET)
+    assert company.metric('assets') is assets
+    assert statement['Assets'] == assets.filings[-1]['val'] == 15070
+    assert statement['Goodwill'] is None
+    assert statement['Form'] == '10-K'
+
+
+def test_statements_align_periods(fetcher):
+    company = Company('MSFT', fetcher)
+    table = company.statements(StatementType.INCOME_STATEMENT)
+    assert table.periods[0] == 'CY2023Q1'
+    assert len(table) == 8
+    assert table.values['Revenue'] == [1800 + i * 10 for i in range(8)]
+    assert table.values['COGS'] == [None] * 8
+    assert table.period('CY2024Q4') == company.statement(
+        StatementType.INCOME_STATEMENT
+    )
+    assert table.ends[-1] == '2024-12-31'
+
+    annual = company.statements(StatementType.BALANCE_SHEET, annual=True)
+    assert annual.periods == ['CY2023', 'CY2024']
+    assert annual.values['Assets'] == [10030, 10070]
+
+    recent = company.statements(StatementType.BALANCE_SHEET, last=2)
+    assert recent.periods == ['CY2024Q3', 'CY2024Q4']
+    assert [row['Period'] for row in recent.rows()] == recent.periods
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_iter_companies_from_zip(bulkdata, prefetch):
+    companies = iter_companies(
+        bulkdata / 'companyfacts.zip',
+        company_tickers = bulkdata / 'company_tickers.json',
+        prefetch = prefetch,
+    )
+    by_ticker = {c.ticker: c for c in companies}
+    assert sorted(by_ticker) == ['AAPL', 'GOOGL', 'MSFT']
+    assert by_ticker['GOOGL'].cik == 1652044
+    assert by_ticker['MSFT'].metric('revenue').at('CY2024Q4')['val'] == 1870
+
+    # Stopping early leaves nothing running
+    first = next(iter_companies(bulkdata / 'companyfacts.zip', prefetch=1))
+    assert first.ticker == str(first.cik)
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_iter_companies_filters_before_decoding(bulkdata, lazy):
+    facts_dir = bulkdata / 'companyfacts'
+    sparse = make_companyfacts(1111, 'No Revenue Corp')
+    del sparse['facts']['us-gaap']['Revenues']
+    (facts_dir / companyfacts_name(1111)).write_text(json.dumps(sparse))
+    (facts_dir / companyfacts_name(2222)).write_text('{"cik": 2222')
+
+    with pytest.raises(FileDecodeError):
+        list(iter_companies(facts_dir, lazy=lazy))
+    everyone = list(iter_companies(facts_dir, lazy=lazy, skip_errors=True))
+    assert len(everyone) == 4
+
+    filtered = iter_companies(
+        facts_dir,
+        concepts = ['Assets'],
+        metrics = ['revenue'],
+        lazy = lazy,
+        skip_errors = True,
+    )
+    assert sorted(c.cik for c in filtered) == sorted(COMPANIES)
+
+
+def test_iter_companies_skips_unreadable_members(bulkdata, tmp_path):
+    archive = tmp_path / 'companyfacts.zip'
+    archive.write_bytes((bulkdata / 'companyfacts.zip').read_bytes())
+    with zipfile.ZipFile(archive) as zf:
+        info = zf.getinfo(companyfacts_name(789019))
+    # Corrupt the compressed data of one member
+    data = bytearray(archive.read_bytes())
+    start = info.header_offset + 30 + len(info.filename)
+    for i in range(start + 10, start + 40):
+        data[i] ^= 0xFF
+    archive.write_bytes(bytes(data))
+
+    with pytest.raises(FetchError):
+        list(iter_companies(archive))
+    companies = list(iter_companies(archive, skip_errors=True))
+    assert sorted(c.cik for c in companies) == [320193, 1652044]
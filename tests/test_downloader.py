@@ -0,0 +1,252 @@
+"""Tests for the bulk data `Downloader`."""
+
+import hashlib
+import io
+import json
+import zipfile
+
+import pytest
+from conftest import (
+    COMPANIES,
+    companyfacts_name,
+    make_companyfacts,
+    static_file,
+)
+
+from secfilr._network import DownloadState, HTTPClient
+from secfilr.downloader import ArchiveDelta, Downloader, _merge_deltas
+from secfilr.exceptions import DownloadError, FetchError, TickerNotFound
+from secfilr.store import FetchStore
+
+
+@pytest.fixture
+def edgar(server, bulkdata):
+    """Serve bulk files from the stand-in server."""
+    server.routes['/company_tickers.json'] = static_file(
+        (bulkdata / 'company_tickers.json').read_bytes()
+    )
+    server.routes['/companyfacts.zip'] = static_file(
+        (bulkdata / 'companyfacts.zip').read_bytes()
+    )
+    return server
+
+
+def _downloader(server, tmp_path) -> Downloader:
+    dest = tmp_path / 'dest'
+    dest.mkdir(exist_ok=True)
+    return Downloader(
+        'test agent',
+        dest,
+        client = HTTPClient(rate_limit=100, max_retries=0),
+        cik_url = server.url('/company_tickers.json'),
+        zip_url = server.url('/companyfacts.zip'),
+    )
+
+
+def test_download_skips_unchanged_files(edgar, bulkdata, tmp_path):
+    downloader = _downloader(edgar, tmp_path)
+    assert downloader.download() is True
+    assert downloader.path_facts_zip.read_bytes() == (
+        bulkdata / 'companyfacts.zip'
+    ).read_bytes()
+    extracted = downloader.path_facts_unzipped / 'CIK0000320193.json'
+    mtime = extracted.stat().st_mtime_ns
+
+    edgar.requests.clear()
+    assert downloader.download() is False
+    assert [r[2].get('If-None-Match') for r in edgar.requests] == ['"v1"'] * 2
+    assert extracted.stat().st_mtime_ns == mtime
+
+    # A new archive version is fetched and re-extracted
+    edgar.routes['/companyfacts.zip'] = static_file(
+        (bulkdata / 'companyfacts.zip').read_bytes(), etag='"v2"'
+    )
+    extracted.unlink()
+    assert downloader.download() is True
+    assert extracted.exists()
+    assert downloader._load_manifest()['companyfacts'].etag == '"v2"'
+
+
+def test_download_resumes_partial_file(edgar, bulkdata, tmp_path):
+    downloader = _downloader(edgar, tmp_path)
+    body = (bulkdata / 'companyfacts.zip').read_bytes()
+    part = downloader.path_facts_zip.with_name('companyfacts.zip.part')
+    part.write_bytes(body[:100])
+    downloader._save_manifest({
+        'companyfacts.zip': DownloadState(etag='"v1"', size=len(body))
+    })
+
+    assert downloader._download_companyfacts_zip() is True
+    zip_request = [r for r in edgar.requests if r[1] == '/companyfacts.zip']
+    assert zip_request[0][2]['Range'] == 'bytes=100-'
+    assert downloader.path_facts_zip.read_bytes() == body
+    assert not part.exists()
+
+
+def test_download_restarts_when_file_changed(edgar, bulkdata, tmp_path):
+    downloader = _downloader(edgar, tmp_path)
+    body = (bulkdata / 'companyfacts.zip').read_bytes()
+    part = downloader.path_facts_zip.with_name('companyfacts.zip.part')
+    part.write_bytes(b'stale bytes from an older archive')
+    downloader._save_manifest({
+        'companyfacts.zip': DownloadState(etag='"v0"')
+    })
+
+    assert downloader._download_companyfacts_zip() is True
+    assert downloader.path_facts_zip.read_bytes() == body
+
+
+def test_segmented_download(edgar, bulkdata, tmp_path):
+    downloader = _downloader(edgar, tmp_path)
+    downloader.segments = 3
+    downloader.chunk_size = 512
+    body = (bulkdata / 'companyfacts.zip').read_bytes()
+
+    assert downloader._download_companyfacts_zip() is True
+    assert downloader.path_facts_zip.read_bytes() == body
+    ranges = sorted(
+        r[2]['Range'] for r in edgar.requests if r[0] == 'GET'
+    )
+    assert len(ranges) == 3
+    assert ranges[0].startswith('bytes=0-')
+    state = downloader._load_manifest()['companyfacts.zip']
+    assert state.sha256 == hashlib.sha256(body).hexdigest()
+    assert downloader._download_companyfacts_zip() is False
+
+
+def test_segmented_download_rejects_corrupt_archive(
+    edgar, bulkdata, tmp_path
+):
+    body = bytearray((bulkdata / 'companyfacts.zip').read_bytes())
+    body[100] ^= 0xFF
+    edgar.routes['/companyfacts.zip'] = static_file(bytes(body))
+    downloader = _downloader(edgar, tmp_path)
+    downloader.segments = 2
+
+    with pytest.raises(DownloadError):
+        downloader._download_companyfacts_zip()
+    assert not downloader.path_facts_zip.exists()
+    assert 'companyfacts.zip' not in downloader._load_manifest()
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_download_extracts_universe(edgar, tmp_path, workers):
+    downloader = _downloader(edgar, tmp_path)
+    extracted = downloader.path_facts_unzipped
+
+    downloader.download(
+        universe = ['AAPL', 1652044, '0000320193'],
+        workers = workers
+    )
+    assert sorted(p.name for p in extracted.iterdir()) == [
+        'CIK0000320193.json', 'CIK0001652044.json'
+    ]
+
+    # An unknown ticker fails before anything is pruned
+    with pytest.raises(TickerNotFound, match='MSTF'):
+        downloader.download(universe=['MSTF', '789019'], workers=workers)
+    assert len(list(extracted.iterdir())) == 2
+
+    # Narrowing the universe prunes, widening it extracts what's missing
+    downloader.download(universe=['msft'], workers=workers)
+    assert [p.name for p in extracted.iterdir()] == ['CIK0000789019.json']
+    downloader.download(workers=workers)
+    assert len(list(extracted.iterdir())) == 3
+    assert downloader._load_manifest()['companyfacts'].complete
+
+
+def test_download_reports_progress_and_checksum(edgar, bulkdata, tmp_path):
+    body = (bulkdata / 'companyfacts.zip').read_bytes()
+    reports = []
+    downloader = _downloader(edgar, tmp_path)
+    downloader.progress = reports.append
+    downloader.chunk_size = 256
+
+    # Resume from a partial file, the checksum still covers all of it
+    part = downloader.path_facts_zip.with_name('companyfacts.zip.part')
+    part.write_bytes(body[:1000])
+    downloader._save_manifest({
+        'companyfacts.zip': DownloadState(etag='"v1"', size=len(body))
+    })
+    downloader._download_companyfacts_zip()
+
+    state = downloader._load_manifest()['companyfacts.zip']
+    assert state.sha256 == hashlib.sha256(body).hexdigest()
+    final = reports[-1]
+    assert final.done and final.name == 'companyfacts.zip'
+    assert final.bytes_done == final.total == len(body)
+    assert final.rate > 0 and final.eta == 0
+
+
+def test_truncated_archive_is_rejected_before_extraction(
+    edgar, bulkdata, tmp_path
+):
+    body = (bulkdata / 'companyfacts.zip').read_bytes()
+    edgar.routes['/companyfacts.zip'] = static_file(body[:len(body) // 2])
+    downloader = _downloader(edgar, tmp_path)
+
+    with pytest.raises(DownloadError):
+        downloader.download()
+    assert not downloader.path_facts_zip.exists()
+    assert not downloader.path_facts_unzipped.exists()
+
+
+def _zip_bytes(companies: dict[int, dict]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for cik, facts in companies.items():
+            zf.writestr(companyfacts_name(cik), json.dumps(facts))
+    return buffer.getvalue()
+
+
+def test_pending_deltas_merge():
+    pending = ArchiveDelta(changed={1, 2}, removed={3})
+    new = ArchiveDelta(changed={3, 4}, removed={2})
+    assert _merge_deltas(pending, new) == ArchiveDelta(
+        changed={1, 3, 4}, removed={2}
+    )
+
+
+def test_delta_update_touches_only_changed_companies(edgar, tmp_path):
+    downloader = _downloader(edgar, tmp_path)
+    downloader.download()
+    assert downloader.delta == ArchiveDelta(changed=set(COMPANIES))
+    downloader.build_store()
+    extracted = downloader.path_facts_unzipped
+    apple = extracted / companyfacts_name(320193)
+    apple_mtime = apple.stat().st_mtime_ns
+
+    # Next day: Microsoft restated, Alphabet dropped, Apple unchanged
+    companies = dict(COMPANIES)
+    companies[789019] = make_companyfacts(789019, 'MICROSOFT CORP', 5.0)
+    del companies[1652044]
+    edgar.routes['/companyfacts.zip'] = static_file(
+        _zip_bytes(companies), etag='"v2"'
+    )
+    downloader.download()
+    assert downloader.delta == ArchiveDelta(
+        changed={789019}, removed={1652044}
+    )
+    assert apple.stat().st_mtime_ns == apple_mtime
+    assert sorted(p.name for p in extracted.iterdir()) == [
+        companyfacts_name(320193), companyfacts_name(789019)
+    ]
+
+    # Pending changes outlive the process until the store is updated
+    downloader = _downloader(edgar, tmp_path)
+    downloader.download()
+    assert downloader.delta == ArchiveDelta(
+        changed={789019}, removed={1652044}
+    )
+
+    downloader.build_store(ciks=downloader.delta.ciks)
+    with FetchStore(downloader.path_store, lazy=False) as store:
+        msft = store.companyfacts('MSFT').facts.concepts
+        assert msft == companies[789019]['facts']['us-gaap']
+        assert store.companyfacts('AAPL').name == 'Apple Inc.'
+        with pytest.raises(FetchError):
+            store.companyfacts('GOOG')
+
+    # Unchanged archive, nothing to reprocess
+    downloader.download()
+    assert not downloader.delta
@@ -0,0 +1,279 @@
+"""Tests for companyfacts fetchers."""
+
+import asyncio
+import json
+import os
+import zipfile
+
+import pytest
+from conftest import COMPANIES, companyfacts_name, static_file
+
+from secfilr._cache import HTTPCache
+from secfilr._index import CIKIndex
+from secfilr._models import (
+    CompanyFacts,
+    companyfacts_nbytes,
+    concept_nbytes,
+)
+from secfilr._network import HTTPClient
+from secfilr.exceptions import (
+    FetchError,
+    IndexUnavailable,
+    RequestError,
+    TickerNotFound,
+)
+from secfilr.fetch import (
+    AsyncFetchRequest,
+    Fetch,
+    FetchBulk,
+    FetchCache,
+    FetchRequest,
+    FetchZip,
+)
+
+
+def test_cik_index_lookups(bulkdata):
+    text = (bulkdata / 'company_tickers.json').read_text()
+    index = CIKIndex.from_json(text)
+    assert index.ticker(' aapl ').cik == 320193
+    assert index.cik(1652044).ticker == 'GOOGL'
+    assert index.ciks() == [320193, 789019, 1652044]
+    assert 'GOOG' in index
+    with pytest.raises(TickerNotFound):
+        index.ticker('NOPE')
+
+
+def test_fetch_bulk_persists_and_refreshes_index(bulkdata):
+    tickers = bulkdata / 'company_tickers.json'
+    index_path = bulkdata / 'company_tickers.index.json'
+    fetcher = FetchBulk(tickers, bulkdata / 'companyfacts', index_path)
+
+    facts = fetcher.companyfacts('msft')
+    assert facts.cik == 789019
+    assert index_path.exists()
+    assert fetcher.cik_index() is fetcher.cik_index()
+
+    # A fresh fetcher reuses the persisted index
+    reloaded = FetchBulk(tickers, bulkdata / 'companyfacts', index_path)
+    assert len(reloaded.cik_index()) == 4
+
+    # Replacing company_tickers.json invalidates both copies
+    tickers.write_text('{"0": {"cik_str": 1, "ticker": "X", "title": "X"}}')
+    mtime = fetcher.cik_index().timestamp + 10
+    os.utime(tickers, (mtime, mtime))
+    assert fetcher.cik('x').cik == 1
+    assert len(CIKIndex.load(index_path)) == 1
+
+
+def _serve_edgar(server, bulkdata, skip=()):
+    """Register company_tickers.json and companyfacts routes."""
+    server.routes['/files/company_tickers.json'] = (
+        bulkdata / 'company_tickers.json'
+    ).read_bytes()
+    for path in (bulkdata / 'companyfacts').iterdir():
+        if path.name not in skip:
+            server.routes[f'/companyfacts/{path.name}'] = path.read_bytes()
+
+
+def test_async_companyfacts_many(server, bulkdata):
+    _serve_edgar(server, bulkdata, skip={'CIK0000789019.json'})
+    fetcher = AsyncFetchRequest(
+        'test agent',
+        concurrency = 4,
+        client = HTTPClient(rate_limit=100, max_retries=0),
+        cik_url = server.url('/files/company_tickers.json'),
+        facts_url = server.url('/companyfacts/CIK'),
+    )
+
+    async def collect():
+        tickers = ['AAPL', 'MSFT', 'GOOG', 'NOPE']
+        return [r async for r in fetcher.companyfacts_many(tickers)]
+
+    results = {r.ticker: r for r in asyncio.run(collect())}
+    assert results['AAPL'].ok
+    assert results['AAPL'].companyfacts.cik == 320193
+    assert results['GOOG'].companyfacts.name == 'Alphabet Inc.'
+    assert isinstance(results['MSFT'].error, RequestError)
+    assert isinstance(results['NOPE'].error, TickerNotFound)
+    # company_tickers.json was only requested once
+    tickers_requests = [r for r in server.requests if 'tickers' in r[1]]
+    assert len(tickers_requests) == 1
+
+
+def test_async_companyfacts_many_without_index(server, bulkdata):
+    _serve_edgar(server, bulkdata)
+    del server.routes['/files/company_tickers.json']
+    fetcher = AsyncFetchRequest(
+        'test agent',
+        client = HTTPClient(rate_limit=100, max_retries=0),
+        cik_url = server.url('/files/company_tickers.json'),
+        facts_url = server.url('/companyfacts/CIK'),
+    )
+
+    async def collect():
+        return [r async for r in fetcher.companyfacts_many(['AAPL', 'GOOG'])]
+
+    results = asyncio.run(collect())
+    assert sorted(r.ticker for r in results) == ['AAPL', 'GOOG']
+    assert all(isinstance(r.error, RequestError) for r in results)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_fetch_bulk_companyfacts_many(bulkdata, workers):
+    (bulkdata / 'companyfacts' / 'CIK0000789019.json').unlink()
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    tickers = ['GOOG', 'NOPE', 'MSFT', 'AAPL']
+    results = list(
+        fetcher.companyfacts_many(tickers, workers=workers, chunksize=1)
+    )
+    assert [r.ticker for r in results] == tickers
+    assert results[0].companyfacts.cik == 1652044
+    assert isinstance(results[1].error, TickerNotFound)
+    assert isinstance(results[2].error, FetchError)
+    assert len(results[3].companyfacts.facts) == 5
+
+
+def test_fetch_bulk_companyfacts_many_bad_entry(bulkdata):
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    results = list(fetcher.companyfacts_many([None, 'AAPL']))
+    assert isinstance(results[0].error, FetchError)
+    assert results[1].companyfacts.cik == 320193
+
+
+def test_fetch_zip_reads_members_directly(bulkdata):
+    with FetchZip(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts.zip'
+    ) as fetcher:
+        assert set(fetcher.members()) == {320193, 789019, 1652044}
+        facts = fetcher.companyfacts('aapl')
+        assert facts.name == 'Apple Inc.'
+        assert 'Revenues' in facts.facts.concepts
+
+
+def test_fetch_zip_missing_member(bulkdata):
+    archive = bulkdata / 'partial.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for cik, facts in COMPANIES.items():
+            if cik != 789019:
+                zf.writestr(companyfacts_name(cik), json.dumps(facts))
+    with FetchZip(bulkdata / 'company_tickers.json', archive) as fetcher:
+        assert set(fetcher.members()) == {320193, 1652044}
+        with pytest.raises(FetchError):
+            fetcher.companyfacts('MSFT')
+
+
+def test_fetch_request_cache_revalidates(server, bulkdata, tmp_path):
+    body = (bulkdata / 'companyfacts' / 'CIK0000320193.json').read_bytes()
+    server.routes['/files/company_tickers.json'] = (
+        bulkdata / 'company_tickers.json'
+    ).read_bytes()
+    server.routes['/companyfacts/CIK0000320193.json'] = static_file(body)
+    cache = HTTPCache(tmp_path / 'cache', ttl=3600.0)
+    fetcher = FetchRequest(
+        'test agent',
+        client = HTTPClient(rate_limit=100, max_retries=0),
+        cik_url = server.url('/files/company_tickers.json'),
+        facts_url = server.url('/companyfacts/CIK'),
+        cache = cache,
+    )
+    assert fetcher.companyfacts('AAPL').cik == 320193
+    assert fetcher.companyfacts('AAPL').cik == 320193
+    facts_requests = [r for r in server.requests if 'CIK' in r[1]]
+    assert len(facts_requests) == 1
+
+    # Once stale, the entry is revalidated and renewed by a 304
+    cache.ttl = 0.0
+    assert fetcher.companyfacts('AAPL').name == 'Apple Inc.'
+    facts_requests = [r for r in server.requests if 'CIK' in r[1]]
+    assert len(facts_requests) == 2
+    assert facts_requests[-1][2]['If-None-Match'] == '"v1"'
+
+
+def test_http_cache_evicts_least_recently_used(server, tmp_path):
+    for name in ('a', 'b', 'c'):
+        server.routes[f'/{name}'] = name.encode() * 1000
+    client = HTTPClient(rate_limit=100, max_retries=0)
+    cache = HTTPCache(tmp_path / 'cache', max_bytes=2000, compress=False)
+    cache.get(server.url('/a'), client=client)
+    cache.get(server.url('/b'), client=client)
+    cache.get(server.url('/a'), client=client)
+    cache.get(server.url('/c'), client=client)
+    # 'b' was least recently used, and is fetched again
+    assert cache.get(server.url('/b'), client=client) == 'b' * 1000
+    assert [r[1] for r in server.requests] == ['/a', '/b', '/c', '/b']
+    assert len(list((tmp_path / 'cache').glob('*.body'))) == 2
+
+
+def test_fetch_cache_bounds_memory(bulkdata):
+    inner = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    probe = FetchCache(inner)
+    probe.companyfacts('AAPL')
+    one_company = probe.stats().nbytes
+    assert one_company > 0
+
+    cache = FetchCache(inner, max_bytes=int(one_company * 2.5))
+    first = cache.companyfacts('AAPL')
+    assert cache.companyfacts('aapl') is first
+    # Share classes resolve to the same CIK and share an entry
+    assert cache.companyfacts('GOOGL') is cache.companyfacts('GOOG')
+    cache.companyfacts('AAPL')
+    cache.companyfacts('MSFT')
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (3, 3, 1)
+    assert stats.entries == 2
+    assert stats.nbytes <= cache.max_bytes
+    # Alphabet was least recently used and was evicted
+    assert cache.companyfacts('AAPL') is first
+    assert cache.companyfacts('GOOG') is not None
+    assert cache.stats().misses == 4
+
+
+class _NoIndex(Fetch):
+    """Fetcher without a CIK index."""
+
+    def __init__(self, fetcher: Fetch) -> None:
+        self.fetcher = fetcher
+
+    def companyfacts(self, ticker: str) -> CompanyFacts:
+        return self.fetcher.companyfacts(ticker)
+
+
+def test_fetch_cache_without_index(bulkdata):
+    inner = _NoIndex(FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    ))
+    with pytest.raises(IndexUnavailable):
+        inner.cik('AAPL')
+    cache = FetchCache(inner)
+    first = cache.companyfacts('AAPL')
+    assert cache.companyfacts(' aapl ') is first
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+
+def test_fetch_cache_remeasures_lazy_entries(bulkdata):
+    inner = FetchBulk(
+        bulkdata / 'company_tickers.json',
+        bulkdata / 'companyfacts',
+        lazy = True
+    )
+    cache = FetchCache(inner)
+    apple = cache.companyfacts('AAPL')
+    cache.companyfacts('MSFT')
+    before = cache.stats().nbytes
+    grown = before
+    for concept in apple.facts.concepts.values():
+        grown += concept_nbytes(concept)
+
+    # Decoding concepts after caching counts on the next lookup, and
+    # evicts to stay within budget
+    cache.max_bytes = grown - 1
+    assert cache.companyfacts('AAPL') is apple
+    stats = cache.stats()
+    assert stats.evictions == 1 and stats.entries == 1
+    assert stats.nbytes == companyfacts_nbytes(apple) <= cache.max_bytes
@@ -0,0 +1,79 @@
+"""Tests for instrumentation hooks."""
+
+import pytest
+
+from secfilr import instrument
+from secfilr._network import HTTPClient
+from secfilr.company import Company
+from secfilr.exceptions import FetchError
+from secfilr.fetch import FetchBulk, FetchRequest
+
+
+@pytest.fixture
+def stats():
+    stats = instrument.Stats()
+    instrument.add_hook(stats)
+    yield stats
+    instrument.remove_hook(stats)
+
+
+def test_stats_cover_pipeline_stages(stats, server, bulkdata):
+    server.routes['/files/company_tickers.json'] = (
+        bulkdata / 'company_tickers.json'
+    ).read_bytes()
+    facts = (bulkdata / 'companyfacts' / 'CIK0000320193.json').read_bytes()
+    server.routes['/companyfacts/CIK0000320193.json'] = facts
+    fetcher = FetchRequest(
+        'test agent',
+        client = HTTPClient(rate_limit=100, max_retries=0),
+        cik_url = server.url('/files/company_tickers.json'),
+        facts_url = server.url('/companyfacts/CIK'),
+    )
+    company = Company('AAPL', fetcher)
+    company.metric('revenue')
+    company.metric('revenue')
+
+    local = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    local.companyfacts('MSFT')
+    (bulkdata / 'companyfacts' / 'CIK0001652044.json').unlink()
+    with pytest.raises(FetchError):
+        local.companyfacts('GOOG')
+
+    snapshot = stats.snapshot()
+    assert snapshot['network'].count == 2
+    assert snapshot['network'].nbytes > len(facts)
+    # company_tickers.json and companyfacts, twice each
+    assert snapshot['decode'].count == 4
+    assert snapshot['disk'].count == 3
+    assert snapshot['disk'].errors == 1
+    # Company caches parsed metrics
+    assert snapshot['parse'].count == 1
+    assert snapshot['parse'].elapsed > 0
+
+
+def test_no_events_without_hooks(bulkdata):
+    events = []
+    instrument.add_hook(events.append)
+    instrument.remove_hook(events.append)
+    assert not instrument.enabled()
+    FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    ).companyfacts('AAPL')
+    assert events == []
+
+
+def test_failing_hook_warns(stats, bulkdata):
+    def broken(event):
+        raise RuntimeError('metrics backend down')
+
+    instrument.add_hook(broken)
+    try:
+        with pytest.warns(RuntimeWarning, match='metrics backend down'):
+            FetchBulk(
+                bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+            ).companyfacts('AAPL')
+    finally:
+        instrument.remove_hook(broken)
+    assert stats.snapshot()['decode'].count == 2
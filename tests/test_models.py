@@ -0,0 +1,217 @@
+"""Tests for companyfacts decoding."""
+
+import json
+from datetime import date
+
+import pytest
+from conftest import COMPANIES
+
+from secfilr import _json
+from secfilr._index import CIKIndex
+from secfilr._json import available_backends
+from secfilr._models import (
+    FilingColumns,
+    LazyConcepts,
+    PeriodIndex,
+    decode_companyfacts_json,
+)
+from secfilr.company import Company
+from secfilr.exceptions import FileDecodeError
+from secfilr.fetch import FetchBulk
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_lazy_decode_matches_eager(indent):
+    json_str = json.dumps(COMPANIES[320193], indent=indent)
+    eager = decode_companyfacts_json(json_str)
+    lazy = decode_companyfacts_json(json_str, lazy=True)
+    concepts = lazy.facts.concepts
+
+    assert isinstance(concepts, LazyConcepts)
+    assert (lazy.cik, lazy.name) == (eager.cik, eager.name)
+    assert list(concepts) == list(eager.facts.concepts)
+    # Concepts from other taxonomies are not picked up
+    assert concepts['Revenues']['label'] == 'Revenues'
+    assert repr(concepts) == 'LazyConcepts(concepts=5, decoded=1)'
+    assert dict(concepts) == eager.facts.concepts
+
+
+def test_lazy_decode_falls_back_to_full_decode():
+    json_str = json.dumps({
+        'cik': 1,
+        'entityName': 'Empty',
+        'facts': {'us-gaap': {}},
+    })
+    companyfacts = decode_companyfacts_json(json_str, lazy=True)
+    assert companyfacts.facts.concepts == {}
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+@pytest.mark.parametrize('backend', ['auto', *available_backends()])
+def test_json_backends_match_default(backend, trusted):
+    json_str = json.dumps(COMPANIES[789019])
+    expected = decode_companyfacts_json(json_str)
+    decoded = decode_companyfacts_json(
+        json_str, backend=backend, trusted=trusted
+    )
+    assert (decoded.cik, decoded.name) == (expected.cik, expected.name)
+    assert decoded.facts.concepts == expected.facts.concepts
+
+    for bad in ('{"cik": ', '{"cik": 1}'):
+        with pytest.raises(FileDecodeError):
+            decode_companyfacts_json(bad, backend=backend, trusted=trusted)
+
+
+class _StubDecodeError(Exception):
+    pass
+
+
+def test_json_backend_errors_become_decode_errors(bulkdata, monkeypatch):
+    def loads(data):
+        if data == 'bad':
+            raise _StubDecodeError('bad input')
+        return json.loads(data)
+
+    monkeypatch.setattr(_json, '_BACKENDS', dict(_json._BACKENDS))
+    _json._register('stub', loads, _StubDecodeError)
+    with pytest.raises(FileDecodeError):
+        decode_companyfacts_json('bad', backend='stub')
+    with pytest.raises(FileDecodeError):
+        CIKIndex.from_json('bad', backend='stub')
+    text = (bulkdata / 'company_tickers.json').read_text()
+    assert CIKIndex.from_json(text, backend='stub').ticker('MSFT').cik == (
+        789019
+    )
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ValueError, match='not available'):
+        decode_companyfacts_json('{}', backend='nope')
+
+
+def test_trusted_fetcher(bulkdata):
+    default = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json',
+        bulkdata / 'companyfacts',
+        json_backend = 'auto',
+        trusted = True,
+    )
+    assert fetcher.cik('GOOG').cik == 1652044
+    revenue = Company('AAPL', fetcher).metric('revenue')
+    assert revenue == Company('AAPL', default).metric('revenue')
+
+
+def test_lazy_fetcher_metric(bulkdata):
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json',
+        bulkdata / 'companyfacts',
+        lazy = True
+    )
+    company = Company('MSFT', fetcher)
+    assert isinstance(company.facts.concepts, LazyConcepts)
+    assert company.metric('revenue').filings[-1]['val'] == 1870.0
+    assert company.concept('Missing') is None
+
+
+def test_compact_metric_matches_filings(bulkdata):
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    company = Company('AAPL', fetcher)
+    metric = company.metric('revenue')
+    compact = company.metric('revenue', compact=True)
+    columns = compact.filings
+
+    assert isinstance(columns, FilingColumns)
+    assert len(compact) == len(metric) == 8
+    assert columns[-1] == metric.filings[-1]
+    assert columns[-1].get('frame') == 'CY2024Q4'
+    assert columns.to_filings() == metric.filings
+    assert sum(columns.val) == sum(f['val'] for f in metric.filings)
+    assert columns.form.categories == ['10-Q', '10-K']
+
+    # Instant facts have no start date
+    assets = company.metric('assets').compact()
+    assert 'start' not in assets.filings[0]
+    assert assets.filings[0].get('start') is None
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_metric_period_lookups(bulkdata, compact):
+    fetcher = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    revenue = Company('AAPL', fetcher).metric('revenue', compact=compact)
+
+    assert revenue.at('CY2024Q3')['val'] == 2760
+    assert revenue.at((2024, 'Q3', '10-Q'))['val'] == 2760
+    assert revenue.at((2024, 'FY', '10-K'))['val'] == 2770
+    assert revenue.at(date(2024, 9, 30))['val'] == 2760
+    assert revenue.at('2023-03-31')['frame'] == 'CY2023Q1'
+    assert revenue.index.get('CY2019Q1') is None
+    with pytest.raises(KeyError):
+        revenue.at((2019, 'Q1', '10-Q'))
+
+    window = revenue.between('2023-07-01', date(2024, 3, 31))
+    assert [f['val'] for f in window] == [2720, 2730, 2740]
+    assert revenue.between('2025-01-01', '2025-12-31') == []
+
+
+def test_period_index_prefers_latest_and_shortest():
+    filings = [
+        {'start': '2024-01-01', 'end': '2024-12-31', 'val': 400,
+         'fy': 2024, 'fp': 'FY', 'form': '10-K', 'filed': '2025-02-01',
+         'frame': 'CY2024'},
+        {'start': '2024-10-01', 'end': '2024-12-31', 'val': 100,
+         'fy': 2024, 'fp': 'FY', 'form': '10-K', 'filed': '2025-02-01',
+         'frame': 'CY2024Q4'},
+        {'start': '2023-01-01', 'end': '2023-12-31', 'val': 300,
+         'fy': 2024, 'fp': 'FY', 'form': '10-K', 'filed': '2025-02-01'},
+        {'start': '2024-10-01', 'end': '2024-12-31', 'val': 110,
+         'fy': 2025, 'fp': 'FY', 'form': '10-K', 'filed': '2026-02-01'},
+        # A 10-Q reports the quarter and year to date under one key
+        {'start': '2024-04-01', 'end': '2024-06-30', 'val': 100,
+         'fy': 2024, 'fp': 'Q2', 'form': '10-Q', 'filed': '2024-08-01'},
+        {'start': '2024-01-01', 'end': '2024-06-30', 'val': 190,
+         'fy': 2024, 'fp': 'Q2', 'form': '10-Q', 'filed': '2024-08-01'},
+    ]
+    for ordered in (filings, filings[::-1]):
+        index = PeriodIndex(ordered)
+        # Restated in a later filing, without a frame
+        assert index.at('2024-12-31')['val'] == 110
+        assert index.at('CY2024')['val'] == 400
+        # A 10-K's fiscal key means its own, latest, full year
+        assert index.at((2024, 'FY', '10-K'))['val'] == 400
+        # A 10-Q's fiscal key means its quarter
+        assert index.at((2024, 'Q2', '10-Q'))['val'] == 100
+        assert index.at('2024-06-30')['val'] == 100
+        assert [
+            f['val'] for f in index.between('2023-12-31', '2023-12-31')
+        ] == [300]
+
+
+def test_period_index_calendar():
+    filings = [
+        {'end': '2024-09-30', 'val': 1, 'filed': '2024-11-01',
+         'frame': 'CY2024Q3I'},
+        {'end': '2024-12-31', 'val': 2, 'filed': '2025-02-01',
+         'frame': 'CY2024Q4I'},
+        {'end': '2023-12-31', 'val': 3, 'filed': '2024-02-01',
+         'frame': 'CY2023'},
+        {'end': '2024-09-30', 'val': 4, 'filed': '2024-10-01',
+         'frame': 'CY2024Q3'},
+        {'end': '2024-12-31', 'val': 5, 'filed': '2025-02-01'},
+    ]
+    index = PeriodIndex(filings)
+    quarters = index.calendar()
+    assert list(quarters) == ['CY2024Q3', 'CY2024Q4']
+    # The latest filed wins
+    assert quarters['CY2024Q3']['val'] == 1
+    years = index.calendar(annual=True)
+    assert {p: f['val'] for p, f in years.items()} == {
+        'CY2023': 3, 'CY2024': 2
+    }
+    assert index.calendar() is quarters
@@ -0,0 +1,48 @@
+"""Tests for the pooled, rate-limited HTTP client."""
+
+import time
+
+import pytest
+
+from secfilr._network import HTTPClient, RateLimiter, make_request
+from secfilr.exceptions import RequestError
+
+
+def test_rate_limiter_paces_requests():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+
+
+def test_retry_honours_retry_after(server):
+    attempts = []
+
+    def throttled(handler):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return 429, {'Retry-After': '0.2'}, b'slow down'
+        return 200, {}, b'ok'
+
+    server.routes['/data'] = throttled
+    client = HTTPClient(rate_limit=100, backoff=0)
+    assert make_request(server.url('/data'), client=client) == 'ok'
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.15
+
+
+def test_gives_up_after_max_retries(server):
+    server.routes['/down'] = lambda handler: (503, {}, b'')
+    client = HTTPClient(rate_limit=100, max_retries=2, backoff=0)
+    with pytest.raises(RequestError):
+        make_request(server.url('/down'), client=client)
+    assert len(server.requests) == 3
+
+
+def test_connections_are_reused(server):
+    server.routes['/a'] = b'a'
+    client = HTTPClient(rate_limit=100)
+    for _ in range(3):
+        make_request(server.url('/a'), client=client)
+    assert len(server.peers) == 1
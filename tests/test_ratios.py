@@ -0,0 +1,121 @@
+"""Tests for the ratio engine."""
+
+import json
+import math
+from array import array
+
+import pytest
+from conftest import make_companyfacts
+
+from secfilr import ratios as ratios_module
+from secfilr._models import decode_companyfacts_json
+from secfilr.company import Company
+from secfilr.exceptions import InvalidMetric
+from secfilr.fetch import FetchBulk
+from secfilr.ratios import ratios, ratios_many
+
+
+@pytest.fixture(autouse=True, params=['python', 'numpy'])
+def column_backend(request, monkeypatch):
+    """Run each test with and without numpy column operations."""
+    if request.param == 'python':
+        monkeypatch.setattr(ratios_module, 'np', None)
+    elif ratios_module.np is None:
+        pytest.skip('numpy is not installed')
+    return request.param
+
+
+@pytest.fixture
+def fetcher(bulkdata):
+    return FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+
+
+def test_quarterly_ratios(fetcher):
+    table = ratios(Company('AAPL', fetcher))
+    assert table.periods[0] == 'CY2023Q1'
+    assert table.periods[-1] == 'CY2024Q4'
+    assert len(table) == 8
+    net_margin = table.series('net_margin')
+    assert net_margin['CY2024Q3'] == pytest.approx(360 / 2760)
+    assert table.series('roe')['CY2024Q3'] == pytest.approx(360 / 6060)
+    growth = table.series('revenue_growth')
+    assert 'CY2023Q4' not in growth
+    assert growth['CY2024Q1'] == pytest.approx(40 / 2700)
+    # Not reported by the fixture companies
+    assert table.series('current_ratio') == {}
+    row = next(table.rows())
+    assert row['Period'] == 'CY2023Q1'
+    assert row['fcf'] is None
+
+
+def test_batch_matches_single(fetcher):
+    companies = [Company(t, fetcher) for t in ('AAPL', 'MSFT', 'GOOGL')]
+    names = ['net_margin', 'roa', 'earnings_growth']
+    tables = ratios_many(companies, names, last=2)
+    for company, table in zip(companies, tables, strict=True):
+        single = ratios(company, names, last=2)
+        assert table.periods == single.periods == ['CY2024Q3', 'CY2024Q4']
+        for name in names:
+            assert list(table.values[name]) == list(single.values[name])
+    assert tables[1].series('net_margin')['CY2024Q4'] == pytest.approx(
+        270 / 1870
+    )
+
+
+def test_annual_ratios(fetcher):
+    table = ratios(Company('AAPL', fetcher), ['roa'], annual=True)
+    assert table.periods == ['CY2023', 'CY2024']
+    # Only balance sheet values carry an annual frame in the fixture
+    assert all(math.isnan(v) for v in table.values['roa'])
+
+
+def test_companies_without_data():
+    facts = make_companyfacts(1, 'Empty Inc.')
+    facts['facts']['us-gaap'] = {}
+    empty = Company.from_companyfacts(
+        decode_companyfacts_json(json.dumps(facts))
+    )
+    table = ratios(empty)
+    assert table.periods == []
+    assert all(len(v) == 0 for v in table.values.values())
+    assert ratios_many([]) == []
+
+
+def test_batch_shorter_than_growth_lag():
+    companies = []
+    for cik in (1, 2):
+        facts = make_companyfacts(cik, f'Company {cik}')
+        for concept in facts['facts']['us-gaap'].values():
+            for filings in concept['units'].values():
+                filings[:] = [f for f in filings if f.get('fy') == 2023][:2]
+        companies.append(Company.from_companyfacts(
+            decode_companyfacts_json(json.dumps(facts))
+        ))
+    tables = ratios_many(companies, ['net_margin', 'revenue_growth'])
+    for table in tables:
+        assert table.periods == ['CY2023Q1', 'CY2023Q2']
+        assert table.series('revenue_growth') == {}
+        assert table.series('net_margin')['CY2023Q2'] == pytest.approx(
+            110 / 910
+        )
+
+
+def test_unknown_ratio(fetcher):
+    with pytest.raises(InvalidMetric):
+        ratios(Company('AAPL', fetcher), ['nope'])
+
+
+def test_column_operations():
+    nan = math.nan
+    quotient = ratios_module._div(
+        array('d', [1, 2, nan, 3]), array('d', [0, 4, 1, nan])
+    )
+    assert quotient[1] == 0.5
+    assert all(math.isnan(quotient[i]) for i in (0, 2, 3))
+    # Two companies of three periods, growth over one period
+    change = ratios_module._growth(array('d', [2, 3, 0, -4, -2, 1]), 3, 1)
+    assert math.isnan(change[0]) and math.isnan(change[3])
+    assert list(change[1:3]) == [0.5, -1.0]
+    assert list(change[4:]) == [0.5, 1.5]
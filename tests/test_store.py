@@ -0,0 +1,76 @@
+"""Tests for the local companyfacts store."""
+
+import pytest
+
+from secfilr.company import Company
+from secfilr.exceptions import FetchError, FileDecodeError, TickerNotFound
+from secfilr.fetch import FetchBulk
+from secfilr.store import FetchStore, build_store
+
+
+@pytest.fixture
+def store(bulkdata):
+    db_path = bulkdata / 'companyfacts.db'
+    build_store(
+        db_path,
+        bulkdata / 'company_tickers.json',
+        bulkdata / 'companyfacts.zip'
+    )
+    with FetchStore(db_path) as fetcher:
+        yield fetcher
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_store_matches_bulk(bulkdata, store, lazy):
+    store.lazy = lazy
+    bulk = FetchBulk(
+        bulkdata / 'company_tickers.json', bulkdata / 'companyfacts'
+    )
+    for ticker in ('AAPL', 'MSFT', 'GOOG'):
+        expected = bulk.companyfacts(ticker)
+        actual = store.companyfacts(ticker)
+        assert (actual.cik, actual.name) == (expected.cik, expected.name)
+        assert dict(actual.facts.concepts) == expected.facts.concepts
+
+
+def test_store_serves_company(store):
+    company = Company('googl', store)
+    assert company.name == 'Alphabet Inc.'
+    assert company.metric('revenue').filings[-1]['frame'] == 'CY2024Q4'
+    with pytest.raises(TickerNotFound):
+        store.companyfacts('NOPE')
+
+
+@pytest.mark.parametrize('metric, period', [
+    ('revenue', 'CY2024Q3'),
+    ('assets', 'CY2024Q4'),
+    ('equity', 'CY2023Q1I'),
+    ('revenue', 'CY2024Q3I'),
+])
+def test_frame_matches_company_metric(store, metric, period):
+    values = store.frame(metric, period)
+    assert set(values) == {320193, 789019, 1652044}
+    for ticker in ('AAPL', 'MSFT', 'GOOG'):
+        company_metric = Company(ticker, store).metric(metric)
+        expected = [
+            f for f in company_metric.filings
+            if f['frame'].removesuffix('I') == period.removesuffix('I')
+        ]
+        actual = values[store.cik(ticker).cik]
+        assert actual.filings == expected
+        assert actual.unit == company_metric.unit
+
+
+def test_frame_missing_period(store):
+    assert store.frame('revenue', 'CY1999Q1') == {}
+
+
+def test_failed_build_leaves_no_temp_file(bulkdata):
+    db_path = bulkdata / 'companyfacts.db'
+    facts_dir = bulkdata / 'companyfacts'
+    (facts_dir / 'CIK0000000001.json').write_text('{"cik": 1')
+    with pytest.raises(FileDecodeError):
+        build_store(db_path, bulkdata / 'company_tickers.json', facts_dir)
+    with pytest.raises(FetchError):
+        build_store(db_path, bulkdata / 'missing.json', facts_dir)
+    assert sorted(p.name for p in bulkdata.glob('companyfacts.db*')) == []